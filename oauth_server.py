@@ -1,92 +1,110 @@
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from urllib.parse import urlparse, parse_qs, urlencode
-import requests
-import json
+from pathlib import Path
+from urllib.parse import urlencode
+import asyncio
 import os
 
+import httpx
+import orjson
+import uvicorn
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse, PlainTextResponse
+
 CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", "")
 CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET", "")
 REDIRECT_URI = "https://libraries-tub-bruce-capable.trycloudflare.com/callback"
 SCOPES = "https://www.googleapis.com/auth/calendar https://www.googleapis.com/auth/calendar.events https://www.googleapis.com/auth/gmail.readonly https://www.googleapis.com/auth/gmail.send"
+TOKEN_URL = "https://oauth2.googleapis.com/token"
+REFRESH_TOKEN_FILE = Path("/root/ai-agents/refresh_token.txt")
+
+# Auth URL and landing page only depend on startup constants: build them once
+AUTH_PARAMS = {
+    "client_id": CLIENT_ID,
+    "redirect_uri": REDIRECT_URI,
+    "response_type": "code",
+    "scope": SCOPES,
+    "access_type": "offline",
+    "prompt": "consent"
+}
+AUTH_URL = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(AUTH_PARAMS)}"
+INDEX_HTML = f"""
+    <h1>Google OAuth Setup</h1>
+    <p><a href="{AUTH_URL}" target="_blank">Clicca qui per autorizzare</a></p>
+    <p>Oppure copia questo URL:</p>
+    <textarea style="width:100%;height:100px">{AUTH_URL}</textarea>
+    """.encode()
+
+# Shared pooled client: keeps the TLS connection to Google alive across callbacks
+CLIENT = httpx.AsyncClient(
+    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+    http2=True,
+    timeout=10.0,
+)
+
+app = FastAPI()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await CLIENT.aclose()
+
+
+@app.get("/", response_class=HTMLResponse)
+async def index():
+    return HTMLResponse(INDEX_HTML)
+
+
+@app.get("/callback", response_class=HTMLResponse)
+async def callback(code: str | None = None, error: str | None = None):
+    # Google redirects with ?error=... when the user denies consent
+    if error:
+        return PlainTextResponse(f"Authorization failed: {error}", status_code=400)
+    if not code:
+        return PlainTextResponse("Missing code", status_code=400)
+
+    # Exchange code for tokens (non-blocking: the event loop keeps serving other requests)
+    data = {
+        "client_id": CLIENT_ID,
+        "client_secret": CLIENT_SECRET,
+        "code": code,
+        "grant_type": "authorization_code",
+        "redirect_uri": REDIRECT_URI
+    }
+    response = await CLIENT.post(TOKEN_URL, data=data)
+    tokens = response.json()
+
+    if "refresh_token" not in tokens:
+        return f"<h1>Errore</h1><pre>{orjson.dumps(tokens, option=orjson.OPT_INDENT_2).decode()}</pre>"
+
+    refresh_token = tokens["refresh_token"]
+    # Save to file (in a thread: don't block the event loop on disk I/O)
+    await asyncio.to_thread(REFRESH_TOKEN_FILE.write_text, refresh_token)
+    print(f"\n\n=== REFRESH TOKEN ===\n{refresh_token}\n=====================\n")
+
+    return f"""
+    <h1>Successo!</h1>
+    <h2>Refresh Token:</h2>
+    <textarea style="width:100%;height:150px">{refresh_token}</textarea>
+    <p>Copia questo token e aggiungilo al file .env</p>
+    <pre>{orjson.dumps(tokens, option=orjson.OPT_INDENT_2).decode()}</pre>
+    """
+
+
+if __name__ == "__main__":
+    print("=" * 50)
+    print("Server OAuth in ascolto su porta 9999")
+    print("=" * 50)
+    print(f"\n1. Vai su: http://srv938822.hstgr.cloud:9999/")
+    print("\n2. IMPORTANTE: Aggiungi questo redirect URI nella Google Cloud Console:")
+    print(f"   {REDIRECT_URI}")
+    print("\n3. Clicca il link e autorizza")
+    print("=" * 50)
 
-class OAuthHandler(BaseHTTPRequestHandler):
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        
-        if parsed.path == "/":
-            # Generate auth URL
-            params = {
-                "client_id": CLIENT_ID,
-                "redirect_uri": REDIRECT_URI,
-                "response_type": "code",
-                "scope": SCOPES,
-                "access_type": "offline",
-                "prompt": "consent"
-            }
-            auth_url = f"https://accounts.google.com/o/oauth2/v2/auth?{urlencode(params)}"
-            
-            self.send_response(200)
-            self.send_header("Content-type", "text/html")
-            self.end_headers()
-            html = f"""
-            <h1>Google OAuth Setup</h1>
-            <p><a href="{auth_url}" target="_blank">Clicca qui per autorizzare</a></p>
-            <p>Oppure copia questo URL:</p>
-            <textarea style="width:100%;height:100px">{auth_url}</textarea>
-            """
-            self.wfile.write(html.encode())
-            
-        elif parsed.path == "/callback":
-            # Handle callback
-            params = parse_qs(parsed.query)
-            code = params.get("code", [None])[0]
-            
-            if code:
-                # Exchange code for tokens
-                token_url = "https://oauth2.googleapis.com/token"
-                data = {
-                    "client_id": CLIENT_ID,
-                    "client_secret": CLIENT_SECRET,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": REDIRECT_URI
-                }
-                response = requests.post(token_url, data=data)
-                tokens = response.json()
-                
-                self.send_response(200)
-                self.send_header("Content-type", "text/html")
-                self.end_headers()
-                
-                if "refresh_token" in tokens:
-                    refresh_token = tokens["refresh_token"]
-                    html = f"""
-                    <h1>Successo!</h1>
-                    <h2>Refresh Token:</h2>
-                    <textarea style="width:100%;height:150px">{refresh_token}</textarea>
-                    <p>Copia questo token e aggiungilo al file .env</p>
-                    <pre>{json.dumps(tokens, indent=2)}</pre>
-                    """
-                    # Save to file
-                    with open("/root/ai-agents/refresh_token.txt", "w") as f:
-                        f.write(refresh_token)
-                    print(f"\n\n=== REFRESH TOKEN ===\n{refresh_token}\n=====================\n")
-                else:
-                    html = f"<h1>Errore</h1><pre>{json.dumps(tokens, indent=2)}</pre>"
-                
-                self.wfile.write(html.encode())
-            else:
-                self.send_response(400)
-                self.end_headers()
-                self.wfile.write(b"Missing code")
-
-print("=" * 50)
-print("Server OAuth in ascolto su porta 9999")
-print("=" * 50)
-print(f"\n1. Vai su: http://srv938822.hstgr.cloud:9999/")
-print("\n2. IMPORTANTE: Aggiungi questo redirect URI nella Google Cloud Console:")
-print(f"   {REDIRECT_URI}")
-print("\n3. Clicca il link e autorizza")
-print("=" * 50)
-
-HTTPServer(("0.0.0.0", 9999), OAuthHandler).serve_forever()
+    # uvloop + httptools come with uvicorn[standard]
+    uvicorn.run(
+        "oauth_server:app",
+        host="0.0.0.0",
+        port=9999,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+    )
@@ -1,5 +1,9 @@
 """
 Eseguire questo SQL in Supabase Dashboard -> SQL Editor
+
+Le RPC match_* sono chiamate ad ogni richiesta: in produzione impostare
+SUPABASE_POSTGRES_URL sul transaction pooler di Supabase (porta 6543) così
+jarvis.db.pool le esegue su connessioni riusate invece che via REST.
 """
 
 SCHEMA_SQL = """
@@ -7,17 +11,37 @@ SCHEMA_SQL = """
 CREATE EXTENSION IF NOT EXISTS vector;
 
 -- Chat History
+-- Partizionata per hash su user_id: le righe (e gli indici) di un utente stanno in una sola
+-- partizione, quindi il caricamento della conversazione tocca solo quella.
+-- org_id (FK su organizations), il suo indice e le policy per org non sono qui: li aggiunge
+-- supabase/migrations/20260214092654_auth_and_orgs.sql, che crea anche organizations.
 CREATE TABLE IF NOT EXISTS chat_history (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     user_id TEXT NOT NULL,
     role TEXT NOT NULL CHECK (role IN ('user', 'assistant', 'system')),
     content TEXT NOT NULL,
     metadata JSONB DEFAULT '{}',
     tokens_used INT,  -- Track token usage per message
-    created_at TIMESTAMPTZ DEFAULT NOW()
-);
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (id, user_id)  -- La chiave di partizione deve far parte della PK
+) PARTITION BY HASH (user_id);
 
-CREATE INDEX IF NOT EXISTS idx_chat_history_user_id ON chat_history(user_id);
+DO $$
+BEGIN
+    FOR i IN 0..15 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS chat_history_p%s PARTITION OF chat_history '
+            'FOR VALUES WITH (MODULUS 16, REMAINDER %s)', i, i
+        );
+    END LOOP;
+END $$;
+
+-- Indice per "ultimi N messaggi di un utente": già ordinato, niente sort.
+-- content NON va in INCLUDE: le colonne INCLUDE non vanno mai out-of-line e una risposta
+-- lunga supererebbe il limite di ~2704 byte per tupla B-tree, facendo fallire l'INSERT.
+-- Rende superfluo l'indice singolo su user_id (è il prefisso di questo).
+CREATE INDEX IF NOT EXISTS idx_chat_history_user_recent ON chat_history(user_id, created_at DESC)
+    INCLUDE (role, tokens_used);
 CREATE INDEX IF NOT EXISTS idx_chat_history_created_at ON chat_history(created_at DESC);
 
 -- Memory Facts (fatti estratti dalle conversazioni)
@@ -26,15 +50,20 @@ CREATE TABLE IF NOT EXISTS memory_facts (
     user_id TEXT NOT NULL,
     fact TEXT NOT NULL,
     category TEXT NOT NULL CHECK (category IN ('preference', 'fact', 'episode', 'task')),
-    embedding VECTOR(768),  -- Gemini embedding dimension
+    embedding HALFVEC(768),  -- Gemini embedding dimension (FP16: metà memoria di VECTOR)
     importance FLOAT DEFAULT 0.5,
-    source_message_id UUID REFERENCES chat_history(id),
+    source_message_id UUID,  -- id in chat_history (niente FK: chat_history è partizionata)
     created_at TIMESTAMPTZ DEFAULT NOW(),
     last_accessed_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 CREATE INDEX IF NOT EXISTS idx_memory_facts_user_id ON memory_facts(user_id);
-CREATE INDEX IF NOT EXISTS idx_memory_facts_embedding ON memory_facts USING hnsw (embedding vector_cosine_ops);
+-- HNSW su inner product: gli embedding sono L2-normalizzati in ingest (GeminiClient.embed),
+-- quindi <#> dà lo stesso ranking del coseno senza rinormalizzare a ogni confronto.
+-- Parametri espliciti (default pgvector). Le RPC match_* alzano hnsw.ef_search per la recall.
+-- In produzione, su tabelle già popolate, usare CREATE INDEX CONCURRENTLY per non bloccare le scritture.
+CREATE INDEX IF NOT EXISTS idx_memory_facts_embedding ON memory_facts
+    USING hnsw (embedding halfvec_ip_ops) WITH (m = 16, ef_construction = 64);
 
 -- RAG Documents
 CREATE TABLE IF NOT EXISTS rag_documents (
@@ -43,14 +72,15 @@ CREATE TABLE IF NOT EXISTS rag_documents (
     title TEXT NOT NULL,
     content TEXT NOT NULL,
     chunk_index INT DEFAULT 0,
-    embedding VECTOR(768),
+    embedding HALFVEC(768),
     metadata JSONB DEFAULT '{}',
     source_url TEXT,
     created_at TIMESTAMPTZ DEFAULT NOW()
 );
 
 CREATE INDEX IF NOT EXISTS idx_rag_documents_user_id ON rag_documents(user_id);
-CREATE INDEX IF NOT EXISTS idx_rag_documents_embedding ON rag_documents USING hnsw (embedding vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_rag_documents_embedding ON rag_documents
+    USING hnsw (embedding halfvec_ip_ops) WITH (m = 16, ef_construction = 64);
 
 -- User Preferences
 CREATE TABLE IF NOT EXISTS user_preferences (
@@ -111,7 +141,7 @@ CREATE POLICY "Service role can access all user preferences"
 
 -- Function per similarity search
 CREATE OR REPLACE FUNCTION match_memory_facts(
-    query_embedding VECTOR(768),
+    query_embedding HALFVEC(768),
     match_user_id TEXT,
     match_threshold FLOAT DEFAULT 0.7,
     match_count INT DEFAULT 5
@@ -126,24 +156,31 @@ RETURNS TABLE (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+    -- Più candidati dall'indice HNSW: il filtro su user_id e soglia scarta parte dei vicini
+    PERFORM set_config('hnsw.ef_search', '100', true);
+    -- Se il planner ripiega su seq scan (indice freddo, pochi dati) il calcolo distanze va in parallelo
+    PERFORM set_config('max_parallel_workers_per_gather', '4', true);
+
     RETURN QUERY
     SELECT
         mf.id,
         mf.fact,
         mf.category,
         mf.importance,
-        1 - (mf.embedding <=> query_embedding) AS similarity
+        sim.similarity
     FROM memory_facts mf
+    -- Distanza calcolata una sola volta per riga, riusata in WHERE e SELECT
+    CROSS JOIN LATERAL (SELECT -(mf.embedding <#> query_embedding) AS similarity) sim
     WHERE mf.user_id = match_user_id
-      AND 1 - (mf.embedding <=> query_embedding) > match_threshold
-    ORDER BY similarity DESC
+      AND sim.similarity > match_threshold
+    ORDER BY mf.embedding <#> query_embedding
     LIMIT match_count;
 END;
 $$;
 
 -- Function per RAG similarity search
 CREATE OR REPLACE FUNCTION match_rag_documents(
-    query_embedding VECTOR(768),
+    query_embedding HALFVEC(768),
     match_user_id TEXT,
     match_threshold FLOAT DEFAULT 0.7,
     match_count INT DEFAULT 5
@@ -157,16 +194,23 @@ RETURNS TABLE (
 LANGUAGE plpgsql
 AS $$
 BEGIN
+    -- Più candidati dall'indice HNSW: il filtro su user_id e soglia scarta parte dei vicini
+    PERFORM set_config('hnsw.ef_search', '100', true);
+    -- Se il planner ripiega su seq scan (indice freddo, pochi dati) il calcolo distanze va in parallelo
+    PERFORM set_config('max_parallel_workers_per_gather', '4', true);
+
     RETURN QUERY
     SELECT
         rd.id,
         rd.title,
         rd.content,
-        1 - (rd.embedding <=> query_embedding) AS similarity
+        sim.similarity
     FROM rag_documents rd
+    -- Distanza calcolata una sola volta per riga, riusata in WHERE e SELECT
+    CROSS JOIN LATERAL (SELECT -(rd.embedding <#> query_embedding) AS similarity) sim
     WHERE rd.user_id = match_user_id
-      AND 1 - (rd.embedding <=> query_embedding) > match_threshold
-    ORDER BY similarity DESC
+      AND sim.similarity > match_threshold
+    ORDER BY rd.embedding <#> query_embedding
     LIMIT match_count;
 END;
 $$;
@@ -224,6 +268,22 @@ CREATE POLICY "Users can view their own tasks"
     ON task_queue FOR SELECT
     USING (user_id = current_setting('request.jwt.claims', true)::json->>'sub');
 
+-- Notifica push ai worker (LISTEN task_new) ad ogni nuovo task: niente polling a vuoto
+CREATE OR REPLACE FUNCTION notify_task_new()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('task_new', NEW.id::text);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS task_notify ON task_queue;
+CREATE TRIGGER task_notify
+    AFTER INSERT ON task_queue
+    FOR EACH ROW EXECUTE FUNCTION notify_task_new();
+
 -- RPC per claim atomico (evita race condition)
 CREATE OR REPLACE FUNCTION claim_next_task(p_worker_id TEXT)
 RETURNS task_queue
@@ -250,26 +310,42 @@ BEGIN
 END;
 $$;
 
+-- RPC per claim atomico di più task in un solo round-trip (SKIP LOCKED: nessuna collisione tra worker)
+CREATE OR REPLACE FUNCTION claim_next_tasks(p_worker_id TEXT, p_batch_size INT DEFAULT 8)
+RETURNS SETOF task_queue
+LANGUAGE sql
+AS $$
+    UPDATE task_queue
+    SET status = 'claimed',
+        claimed_by = p_worker_id,
+        claimed_at = NOW(),
+        updated_at = NOW()
+    WHERE id IN (
+        SELECT id FROM task_queue
+        WHERE status = 'pending'
+          AND (scheduled_at IS NULL OR scheduled_at <= NOW())
+        ORDER BY priority ASC, scheduled_at ASC NULLS FIRST
+        FOR UPDATE SKIP LOCKED
+        LIMIT p_batch_size
+    )
+    RETURNING *;
+$$;
+
 -- RPC per completare un task
 CREATE OR REPLACE FUNCTION complete_task(
     p_task_id UUID,
     p_result JSONB DEFAULT NULL
 )
 RETURNS task_queue
-LANGUAGE plpgsql
+LANGUAGE sql
 AS $$
-DECLARE
-    updated_task task_queue;
-BEGIN
     UPDATE task_queue
     SET status = 'completed',
         result = p_result,
         completed_at = NOW(),
         updated_at = NOW()
     WHERE id = p_task_id
-    RETURNING * INTO updated_task;
-    RETURN updated_task;
-END;
+    RETURNING *;
 $$;
 
 -- RPC per fallire un task
@@ -278,11 +354,8 @@ CREATE OR REPLACE FUNCTION fail_task(
     p_error TEXT
 )
 RETURNS task_queue
-LANGUAGE plpgsql
+LANGUAGE sql
 AS $$
-DECLARE
-    updated_task task_queue;
-BEGIN
     UPDATE task_queue
     SET status = CASE
             WHEN retry_count < max_retries THEN 'pending'
@@ -292,31 +365,27 @@ BEGIN
         retry_count = retry_count + 1,
         updated_at = NOW()
     WHERE id = p_task_id
-    RETURNING * INTO updated_task;
-    RETURN updated_task;
-END;
+    RETURNING *;
 $$;
 
 -- RPC per cleanup task stale (bloccati)
 CREATE OR REPLACE FUNCTION cleanup_stale_tasks(p_timeout_minutes INT DEFAULT 30)
 RETURNS INT
-LANGUAGE plpgsql
+LANGUAGE sql
 AS $$
-DECLARE
-    affected_count INT;
-BEGIN
-    UPDATE task_queue
-    SET status = 'pending',
-        claimed_by = NULL,
-        claimed_at = NULL,
-        started_at = NULL,
-        retry_count = retry_count + 1,
-        updated_at = NOW()
-    WHERE status IN ('claimed', 'running')
-      AND updated_at < NOW() - (p_timeout_minutes || ' minutes')::INTERVAL;
-    GET DIAGNOSTICS affected_count = ROW_COUNT;
-    RETURN affected_count;
-END;
+    WITH updated AS (
+        UPDATE task_queue
+        SET status = 'pending',
+            claimed_by = NULL,
+            claimed_at = NULL,
+            started_at = NULL,
+            retry_count = retry_count + 1,
+            updated_at = NOW()
+        WHERE status IN ('claimed', 'running')
+          AND updated_at < NOW() - make_interval(mins => p_timeout_minutes)
+        RETURNING 1
+    )
+    SELECT count(*)::INT FROM updated;
 $$;
 """
 
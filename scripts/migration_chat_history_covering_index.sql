@@ -0,0 +1,21 @@
+-- Migration: indice per il caricamento degli ultimi messaggi di chat_history
+-- (user_id, created_at DESC) INCLUDE (role, tokens_used) serve
+-- "WHERE user_id = ? ORDER BY created_at DESC LIMIT n" senza sort.
+-- content resta fuori dall'INCLUDE: le colonne INCLUDE non vengono mai salvate out-of-line,
+-- quindi un messaggio lungo supererebbe il limite di ~2704 byte per tupla B-tree e l'INSERT fallirebbe.
+-- L'indice singolo su user_id è un prefisso del nuovo e viene rimosso.
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+DROP INDEX IF EXISTS idx_chat_history_user_id;
+
+-- Rimuove la versione precedente che includeva content
+DROP INDEX IF EXISTS idx_chat_history_user_recent;
+
+CREATE INDEX IF NOT EXISTS idx_chat_history_user_recent ON chat_history(user_id, created_at DESC)
+    INCLUDE (role, tokens_used);
+
+-- Aggiorna le statistiche del planner
+VACUUM (ANALYZE) chat_history;
+
+-- Verifica
+SELECT 'Migration covering index completata!' as status;
@@ -0,0 +1,76 @@
+-- Migration: chat_history partizionata per HASH (user_id) su 16 partizioni
+-- Ogni utente vive in una sola partizione: indici piccoli e working set ridotto
+-- per il caricamento della conversazione.
+-- memory_facts / rag_documents restano non partizionate (indici HNSW globali).
+-- Richiede supabase/migrations/20260214092654_auth_and_orgs.sql già applicata: org_id,
+-- il suo indice e le policy per org vengono ricreati sulla nuova tabella.
+-- Eseguire in Supabase Dashboard -> SQL Editor (in una finestra di manutenzione)
+
+BEGIN;
+
+-- 1. La FK memory_facts.source_message_id -> chat_history(id) non è supportata su tabella
+--    partizionata (la chiave unica deve includere user_id): la rimuoviamo
+ALTER TABLE memory_facts DROP CONSTRAINT IF EXISTS memory_facts_source_message_id_fkey;
+
+-- 2. Sposta la tabella esistente
+ALTER TABLE chat_history RENAME TO chat_history_old;
+
+-- 3. Nuova tabella partizionata
+CREATE TABLE chat_history (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id TEXT NOT NULL,
+    role TEXT NOT NULL CHECK (role IN ('user', 'assistant', 'system')),
+    content TEXT NOT NULL,
+    metadata JSONB DEFAULT '{}',
+    tokens_used INT,
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    org_id UUID REFERENCES organizations(id),
+    PRIMARY KEY (id, user_id)
+) PARTITION BY HASH (user_id);
+
+DO $$
+BEGIN
+    FOR i IN 0..15 LOOP
+        EXECUTE format(
+            'CREATE TABLE chat_history_p%s PARTITION OF chat_history '
+            'FOR VALUES WITH (MODULUS 16, REMAINDER %s)', i, i
+        );
+    END LOOP;
+END $$;
+
+-- 4. Copia dati
+INSERT INTO chat_history (id, user_id, role, content, metadata, tokens_used, created_at, org_id)
+SELECT id, user_id, role, content, metadata, tokens_used, created_at, org_id
+FROM chat_history_old;
+
+DROP TABLE chat_history_old;
+
+-- 5. Indici (propagati automaticamente a tutte le partizioni)
+CREATE INDEX idx_chat_history_user_id ON chat_history(user_id);
+CREATE INDEX idx_chat_history_created_at ON chat_history(created_at DESC);
+CREATE INDEX idx_chat_history_org_id ON chat_history(org_id);
+
+-- 6. RLS e policy (eliminate insieme alla vecchia tabella)
+ALTER TABLE chat_history ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can only access their own chat history"
+    ON chat_history FOR ALL
+    USING (user_id = current_setting('request.jwt.claims', true)::json->>'sub');
+
+CREATE POLICY "Service role can access all chat history"
+    ON chat_history FOR ALL
+    TO service_role
+    USING (true);
+
+CREATE POLICY "Users can view own org chat_history"
+    ON chat_history FOR SELECT
+    USING (org_id IN (SELECT get_user_org_ids()));
+
+CREATE POLICY "Users can insert own org chat_history"
+    ON chat_history FOR INSERT
+    WITH CHECK (org_id IN (SELECT get_user_org_ids()));
+
+COMMIT;
+
+-- Verifica
+SELECT 'Migration chat_history partition completata!' as status;
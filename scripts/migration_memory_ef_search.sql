@@ -0,0 +1,73 @@
+-- Migration: hnsw.ef_search per chiamata nelle RPC match_memory_facts / match_rag_documents
+-- Gli indici v1 sono HNSW (non IVFFlat): l'equivalente di ivfflat.probes è hnsw.ef_search.
+-- Il default (40) con filtro user_id + soglia può restituire meno di match_count risultati.
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+CREATE OR REPLACE FUNCTION match_memory_facts(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    fact TEXT,
+    category TEXT,
+    importance FLOAT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Più candidati dall'indice HNSW: il filtro su user_id e soglia scarta parte dei vicini
+    PERFORM set_config('hnsw.ef_search', '100', true);
+
+    RETURN QUERY
+    SELECT
+        mf.id,
+        mf.fact,
+        mf.category,
+        mf.importance,
+        -(mf.embedding <#> query_embedding) AS similarity
+    FROM memory_facts mf
+    WHERE mf.user_id = match_user_id
+      AND -(mf.embedding <#> query_embedding) > match_threshold
+    ORDER BY mf.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_rag_documents(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    content TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Più candidati dall'indice HNSW: il filtro su user_id e soglia scarta parte dei vicini
+    PERFORM set_config('hnsw.ef_search', '100', true);
+
+    RETURN QUERY
+    SELECT
+        rd.id,
+        rd.title,
+        rd.content,
+        -(rd.embedding <#> query_embedding) AS similarity
+    FROM rag_documents rd
+    WHERE rd.user_id = match_user_id
+      AND -(rd.embedding <#> query_embedding) > match_threshold
+    ORDER BY rd.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- Verifica
+SELECT 'Migration ef_search completata!' as status;
@@ -0,0 +1,90 @@
+-- Migration: embedding di memory_facts / rag_documents da VECTOR(768) a HALFVEC(768)
+-- halfvec usa float16: metà byte per riga e per indice, recall praticamente invariata sul coseno
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+-- 1. Drop indici esistenti
+DROP INDEX IF EXISTS idx_memory_facts_embedding;
+DROP INDEX IF EXISTS idx_rag_documents_embedding;
+
+-- 2. Cambia tipo colonne a halfvec(768)
+ALTER TABLE memory_facts
+ALTER COLUMN embedding TYPE halfvec(768);
+
+ALTER TABLE rag_documents
+ALTER COLUMN embedding TYPE halfvec(768);
+
+-- 3. Ricrea indici HNSW con halfvec
+CREATE INDEX idx_memory_facts_embedding ON memory_facts
+    USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX idx_rag_documents_embedding ON rag_documents
+    USING hnsw (embedding halfvec_cosine_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- 4. Aggiorna funzioni RPC (cambia il tipo del parametro: drop della vecchia firma)
+DROP FUNCTION IF EXISTS match_memory_facts(VECTOR, TEXT, FLOAT, INT);
+DROP FUNCTION IF EXISTS match_rag_documents(VECTOR, TEXT, FLOAT, INT);
+
+CREATE OR REPLACE FUNCTION match_memory_facts(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    fact TEXT,
+    category TEXT,
+    importance FLOAT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        mf.id,
+        mf.fact,
+        mf.category,
+        mf.importance,
+        1 - (mf.embedding <=> query_embedding) AS similarity
+    FROM memory_facts mf
+    WHERE mf.user_id = match_user_id
+      AND 1 - (mf.embedding <=> query_embedding) > match_threshold
+    ORDER BY similarity DESC
+    LIMIT match_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_rag_documents(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    content TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        rd.id,
+        rd.title,
+        rd.content,
+        1 - (rd.embedding <=> query_embedding) AS similarity
+    FROM rag_documents rd
+    WHERE rd.user_id = match_user_id
+      AND 1 - (rd.embedding <=> query_embedding) > match_threshold
+    ORDER BY similarity DESC
+    LIMIT match_count;
+END;
+$$;
+
+-- Verifica
+SELECT 'Migration halfvec completata!' as status;
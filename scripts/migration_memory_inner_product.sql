@@ -0,0 +1,85 @@
+-- Migration: ricerca memory_facts / rag_documents con inner product (<#>) invece del coseno (<=>)
+-- Gli embedding Gemini vengono ora L2-normalizzati in ingest (GeminiClient.embed):
+-- su vettori unitari <#> dà lo stesso ranking del coseno con meno operazioni per confronto.
+-- Richiede migration_memory_halfvec.sql già applicata.
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+-- 1. Normalizza gli embedding già salvati
+UPDATE memory_facts SET embedding = l2_normalize(embedding) WHERE embedding IS NOT NULL;
+UPDATE rag_documents SET embedding = l2_normalize(embedding) WHERE embedding IS NOT NULL;
+
+-- 2. Ricrea indici HNSW con operator class inner product
+DROP INDEX IF EXISTS idx_memory_facts_embedding;
+DROP INDEX IF EXISTS idx_rag_documents_embedding;
+
+CREATE INDEX idx_memory_facts_embedding ON memory_facts
+    USING hnsw (embedding halfvec_ip_ops)
+    WITH (m = 16, ef_construction = 64);
+
+CREATE INDEX idx_rag_documents_embedding ON rag_documents
+    USING hnsw (embedding halfvec_ip_ops)
+    WITH (m = 16, ef_construction = 64);
+
+-- 3. Aggiorna funzioni RPC (<#> restituisce il prodotto scalare negato: ORDER BY ASC resta corretto)
+CREATE OR REPLACE FUNCTION match_memory_facts(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    fact TEXT,
+    category TEXT,
+    importance FLOAT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        mf.id,
+        mf.fact,
+        mf.category,
+        mf.importance,
+        -(mf.embedding <#> query_embedding) AS similarity
+    FROM memory_facts mf
+    WHERE mf.user_id = match_user_id
+      AND -(mf.embedding <#> query_embedding) > match_threshold
+    ORDER BY mf.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_rag_documents(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    content TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        rd.id,
+        rd.title,
+        rd.content,
+        -(rd.embedding <#> query_embedding) AS similarity
+    FROM rag_documents rd
+    WHERE rd.user_id = match_user_id
+      AND -(rd.embedding <#> query_embedding) > match_threshold
+    ORDER BY rd.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- Verifica
+SELECT 'Migration inner product completata!' as status;
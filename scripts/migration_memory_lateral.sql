@@ -0,0 +1,77 @@
+-- Migration: RPC match_memory_facts / match_rag_documents con similarità calcolata una volta
+-- La distanza era valutata due volte per riga candidata (WHERE + SELECT): ora una CROSS JOIN
+-- LATERAL la calcola una sola volta e la riusa.
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+CREATE OR REPLACE FUNCTION match_memory_facts(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    fact TEXT,
+    category TEXT,
+    importance FLOAT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Più candidati dall'indice HNSW: il filtro su user_id e soglia scarta parte dei vicini
+    PERFORM set_config('hnsw.ef_search', '100', true);
+
+    RETURN QUERY
+    SELECT
+        mf.id,
+        mf.fact,
+        mf.category,
+        mf.importance,
+        sim.similarity
+    FROM memory_facts mf
+    -- Distanza calcolata una sola volta per riga, riusata in WHERE e SELECT
+    CROSS JOIN LATERAL (SELECT -(mf.embedding <#> query_embedding) AS similarity) sim
+    WHERE mf.user_id = match_user_id
+      AND sim.similarity > match_threshold
+    ORDER BY mf.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION match_rag_documents(
+    query_embedding HALFVEC(768),
+    match_user_id TEXT,
+    match_threshold FLOAT DEFAULT 0.7,
+    match_count INT DEFAULT 5
+)
+RETURNS TABLE (
+    id UUID,
+    title TEXT,
+    content TEXT,
+    similarity FLOAT
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Più candidati dall'indice HNSW: il filtro su user_id e soglia scarta parte dei vicini
+    PERFORM set_config('hnsw.ef_search', '100', true);
+
+    RETURN QUERY
+    SELECT
+        rd.id,
+        rd.title,
+        rd.content,
+        sim.similarity
+    FROM rag_documents rd
+    -- Distanza calcolata una sola volta per riga, riusata in WHERE e SELECT
+    CROSS JOIN LATERAL (SELECT -(rd.embedding <#> query_embedding) AS similarity) sim
+    WHERE rd.user_id = match_user_id
+      AND sim.similarity > match_threshold
+    ORDER BY rd.embedding <#> query_embedding
+    LIMIT match_count;
+END;
+$$;
+
+-- Verifica
+SELECT 'Migration lateral completata!' as status;
@@ -0,0 +1,28 @@
+-- Migration: claim_next_tasks, claim di più task per chiamata
+-- Il worker paga un solo round-trip per ciclo di polling invece di uno per task.
+-- claim_next_task resta disponibile per compatibilità.
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+-- RPC per claim atomico di più task in un solo round-trip (SKIP LOCKED: nessuna collisione tra worker)
+CREATE OR REPLACE FUNCTION claim_next_tasks(p_worker_id TEXT, p_batch_size INT DEFAULT 8)
+RETURNS SETOF task_queue
+LANGUAGE sql
+AS $$
+    UPDATE task_queue
+    SET status = 'claimed',
+        claimed_by = p_worker_id,
+        claimed_at = NOW(),
+        updated_at = NOW()
+    WHERE id IN (
+        SELECT id FROM task_queue
+        WHERE status = 'pending'
+          AND (scheduled_at IS NULL OR scheduled_at <= NOW())
+        ORDER BY priority ASC, scheduled_at ASC NULLS FIRST
+        FOR UPDATE SKIP LOCKED
+        LIMIT p_batch_size
+    )
+    RETURNING *;
+$$;
+
+-- Verifica
+SELECT 'Migration batch claim completata!' as status;
@@ -0,0 +1,24 @@
+-- Migration: LISTEN/NOTIFY per task_queue
+-- Ogni INSERT invia pg_notify('task_new', id): il worker si sveglia subito invece di fare polling.
+-- Il worker ascolta solo se SUPABASE_POSTGRES_DIRECT_URL è configurato
+-- (serve una connessione di sessione: il transaction pooler non supporta LISTEN).
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+-- Notifica push ai worker (LISTEN task_new) ad ogni nuovo task: niente polling a vuoto
+CREATE OR REPLACE FUNCTION notify_task_new()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    PERFORM pg_notify('task_new', NEW.id::text);
+    RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS task_notify ON task_queue;
+CREATE TRIGGER task_notify
+    AFTER INSERT ON task_queue
+    FOR EACH ROW EXECUTE FUNCTION notify_task_new();
+
+-- Verifica
+SELECT 'Migration task notify completata!' as status;
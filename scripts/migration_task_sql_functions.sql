@@ -0,0 +1,64 @@
+-- Migration: complete_task / fail_task / cleanup_stale_tasks da plpgsql a LANGUAGE sql
+-- Sono UPDATE a singola istruzione: in sql evitano l'interprete PL/pgSQL a ogni chiamata.
+-- Stessa firma e stesso tipo di ritorno: CREATE OR REPLACE basta.
+-- Eseguire in Supabase Dashboard -> SQL Editor
+
+-- RPC per completare un task
+CREATE OR REPLACE FUNCTION complete_task(
+    p_task_id UUID,
+    p_result JSONB DEFAULT NULL
+)
+RETURNS task_queue
+LANGUAGE sql
+AS $$
+    UPDATE task_queue
+    SET status = 'completed',
+        result = p_result,
+        completed_at = NOW(),
+        updated_at = NOW()
+    WHERE id = p_task_id
+    RETURNING *;
+$$;
+
+-- RPC per fallire un task
+CREATE OR REPLACE FUNCTION fail_task(
+    p_task_id UUID,
+    p_error TEXT
+)
+RETURNS task_queue
+LANGUAGE sql
+AS $$
+    UPDATE task_queue
+    SET status = CASE
+            WHEN retry_count < max_retries THEN 'pending'
+            ELSE 'failed'
+        END,
+        error = p_error,
+        retry_count = retry_count + 1,
+        updated_at = NOW()
+    WHERE id = p_task_id
+    RETURNING *;
+$$;
+
+-- RPC per cleanup task stale (bloccati)
+CREATE OR REPLACE FUNCTION cleanup_stale_tasks(p_timeout_minutes INT DEFAULT 30)
+RETURNS INT
+LANGUAGE sql
+AS $$
+    WITH updated AS (
+        UPDATE task_queue
+        SET status = 'pending',
+            claimed_by = NULL,
+            claimed_at = NULL,
+            started_at = NULL,
+            retry_count = retry_count + 1,
+            updated_at = NOW()
+        WHERE status IN ('claimed', 'running')
+          AND updated_at < NOW() - make_interval(mins => p_timeout_minutes)
+        RETURNING 1
+    )
+    SELECT count(*)::INT FROM updated;
+$$;
+
+-- Verifica
+SELECT 'Migration task functions sql completata!' as status;
@@ -33,8 +33,12 @@ class BaseAgent(ABC):
             needs_refresh = state.get("needs_refresh", {}).get(self.resource_type, True)
 
             if not needs_refresh:
-                # Try to get cached data
-                cached = await freshness.get_cached(self.resource_type, user_id)
+                # Try to get cached data (prefetched for the whole plan when available)
+                prefetched = state.get("prefetched_cache", {})
+                if self.resource_type in prefetched:
+                    cached = prefetched[self.resource_type]
+                else:
+                    cached = await freshness.get_cached(self.resource_type, user_id)
                 if cached:
                     self.logger.debug(f"Using cached data for {self.resource_type}")
                     return AgentResult(
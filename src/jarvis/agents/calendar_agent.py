@@ -1,9 +1,15 @@
 """Calendar agent - LLM-powered with intelligent two-step workflow."""
 
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
+from operator import attrgetter
 from typing import Any
-import json
+import hashlib
 import asyncio
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 from jarvis.agents.base import BaseAgent
 from jarvis.core.state import JarvisState
 from jarvis.integrations.google_calendar import calendar_client
@@ -11,6 +17,7 @@ from jarvis.integrations.gemini import gemini
 from jarvis.integrations.openai_embeddings import openai_embeddings
 from jarvis.db.kg_repository import KGEntityRepository, KGAliasRepository
 from jarvis.db.redis_client import redis_client
+from jarvis.config import get_settings
 
 # Tool definitions for the LLM
 CALENDAR_TOOLS = [
@@ -81,9 +88,6 @@ AGENT_SYSTEM_PROMPT = """Sei un agente calendario INTELLIGENTE. Analizza le rich
 OGGI: {today} ({weekday})
 DOMANI: {tomorrow}
 
-TOOL DISPONIBILI:
-{tools}
-
 🧠 REGOLE FONDAMENTALI:
 
 1. CREAZIONE EVENTI - Agisci subito, non chiedere conferme:
@@ -110,20 +114,17 @@ TOOL DISPONIBILI:
 - "lunedì prossimo" = calcola la data
 - "2 febbraio" = 2026-02-02
 
-📝 OUTPUT: Solo JSON valido
-- Singola: {{"tool": "nome", "params": {{...}}}}
-- Multiple (solo per create_event multipli): [{{"tool": "create_event", ...}}, ...]
+📝 OUTPUT: chiama SEMPRE il tool appropriato
+- Più eventi da creare → una chiamata create_event per ciascuno
 
 ESEMPI:
-- "agenda domani" → {{"tool": "get_events", "params": {{"start_date": "{tomorrow}", "end_date": "{tomorrow}"}}}}
-- "crea evento alle 15" → {{"tool": "create_event", "params": {{"title": "Evento", "start_date": "{today}", "start_time": "15:00", "end_time": "16:00"}}}}
-- "blocca da mercoledì 14 a sabato 20" → {{"tool": "create_event", "params": {{"title": "Occupato", "start_date": "2026-01-29", "end_date": "2026-02-01", "start_time": "14:00", "end_time": "20:00"}}}}
-- "cancella l'evento vertua di lunedì 2 febbraio" → {{"tool": "get_events", "params": {{"start_date": "2026-02-02", "end_date": "2026-02-02"}}}}
+- "agenda domani" → get_events(start_date="{tomorrow}", end_date="{tomorrow}")
+- "crea evento alle 15" → create_event(title="Evento", start_date="{today}", start_time="15:00", end_time="16:00")
+- "blocca da mercoledì 14 a sabato 20" → create_event(title="Occupato", start_date="2026-01-29", end_date="2026-02-01", start_time="14:00", end_time="20:00")
+- "cancella l'evento vertua di lunedì 2 febbraio" → get_events(start_date="2026-02-02", end_date="2026-02-02")
   (poi vedrai gli eventi e potrai eliminare quello giusto)
-- "elimina il pranzo di domani" → {{"tool": "get_events", "params": {{"start_date": "{tomorrow}", "end_date": "{tomorrow}"}}}}
-- "sposta il meeting X alle 14" → {{"tool": "search_events", "params": {{"query": "X"}}}}
-
-Rispondi SOLO con JSON."""
+- "elimina il pranzo di domani" → get_events(start_date="{tomorrow}", end_date="{tomorrow}")
+- "sposta il meeting X alle 14" → search_events(query="X")"""
 
 # Prompt for second step - after getting events
 FOLLOWUP_PROMPT = """Hai chiesto gli eventi e questi sono i risultati.
@@ -137,96 +138,469 @@ EVENTI TROVATI:
 Ora scegli l'evento corretto e esegui l'azione richiesta.
 Usa l'event_id REALE mostrato sopra (NON inventare ID, NON usare placeholder).
 
-TOOL DISPONIBILI:
-{tools}
-
 Se l'utente voleva:
-- Eliminare → {{"tool": "delete_event", "params": {{"event_id": "ID_REALE_QUI"}}}}
-- Modificare → {{"tool": "update_event", "params": {{"event_id": "ID_REALE_QUI", ...}}}}
-- Solo vedere → {{"tool": "none", "message": "Ecco gli eventi"}}
+- Eliminare → delete_event(event_id="ID_REALE_QUI")
+- Modificare → update_event(event_id="ID_REALE_QUI", ...)
+- Solo vedere → non chiamare tool, rispondi con un breve messaggio
 
 Se ci sono PIÙ eventi che potrebbero corrispondere, scegli quello più probabile basandoti su:
 - Titolo (quale assomiglia di più alla richiesta?)
 - Orario (se l'utente ha menzionato un'ora)
-- Contesto della conversazione
+- Contesto della conversazione"""
+
+
+# Parameters that are not free-form strings in the function declarations
+_PARAM_TYPES = {"duration_minutes": "INTEGER", "add_meet": "BOOLEAN"}
+_REQUIRED_PARAMS = {
+    "get_events": ["start_date", "end_date"],
+    "search_events": ["query"],
+    "create_event": ["start_date", "start_time", "end_time"],
+    "update_event": ["event_id"],
+    "delete_event": ["event_id"],
+    "find_free_slots": ["start_date", "end_date"],
+}
+
+
+def _function_declaration(tool: dict) -> dict:
+    """Turn a CALENDAR_TOOLS entry into a Gemini function declaration."""
+    return {
+        "name": tool["name"],
+        "description": tool["description"],
+        "parameters": {
+            "type": "OBJECT",
+            "properties": {
+                name: {"type": _PARAM_TYPES.get(name, "STRING"), "description": description}
+                for name, description in tool["parameters"].items()
+            },
+            "required": _REQUIRED_PARAMS.get(tool["name"], []),
+        },
+    }
+
+
+# Tool schemas travel as native function declarations, not inside the prompt text
+CALENDAR_FUNCTIONS = [_function_declaration(t) for t in CALENDAR_TOOLS]
+# Step 2 only picks an event to modify/delete
+FOLLOWUP_FUNCTIONS = [f for f in CALENDAR_FUNCTIONS if f["name"] in ("update_event", "delete_event")]
+
+# Attendees seen in recent reads are not re-enriched before this many seconds
+ATTENDEE_REFRESH_SECONDS = 3600
+# In-process lifetime of a fetched event window (follow-ups within a conversation)
+EVENTS_LOCAL_TTL_SECONDS = 30
+# Attendee enrichment runs on a few workers fed by a bounded queue, so bursts of reads
+# cannot pile up unbounded embedding/DB work (excess batches are dropped)
+ENRICH_WORKERS = 8
+ENRICH_QUEUE_SIZE = 512
+
+
+# Role mailboxes, not people: skipped before any name munging
+_GENERIC_LOCALS = frozenset({"info", "noreply", "no-reply", "admin", "support"})
+_GENERIC_NAMES = frozenset({
+    "info", "support", "admin", "noreply", "no reply", "hello", "contact", "team", "sales",
+})
+
+
+@lru_cache(maxsize=16384)
+def _canonicalize_email(email: str) -> tuple[str, str] | None:
+    """Map an attendee email to (canonical_name, local_part), None for role/short addresses.
+
+    Cached: the same attendees recur across events and reads.
+    """
+    local_part = email.split("@")[0]
+    if local_part.lower() in _GENERIC_LOCALS:
+        return None
+    name_parts = local_part.replace(".", " ").replace("_", " ").replace("-", " ").split()
+    canonical_name = " ".join(p.capitalize() for p in name_parts)
+
+    if len(canonical_name) < 3 or canonical_name.lower() in _GENERIC_NAMES:
+        return None
+    return canonical_name, local_part
+
+
+# Dedicated pool for the blocking Google Calendar client: bounds concurrent API calls and,
+# since the client keeps one HTTP connection per thread, the number of open connections
+_CALENDAR_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="calendar")
+
+
+async def _run_calendar(fn, /, *args, **kwargs):
+    """Run a blocking calendar_client call on the calendar thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_CALENDAR_EXECUTOR, partial(fn, *args, **kwargs))
+
+
+_MODEL = "gemini-2.5-flash"
+_TEMPERATURE = 0.1
+
+
+@lru_cache(maxsize=4)
+def _system_prompt(today: str, tomorrow: str, weekday: str) -> str:
+    """Render the step-1 system prompt once per day; the same string object is reused all day."""
+    return AGENT_SYSTEM_PROMPT.format(today=today, tomorrow=tomorrow, weekday=weekday)
+
+
+WEEKDAY_NAMES = ("Lunedì", "Martedì", "Mercoledì", "Giovedì", "Venerdì", "Sabato", "Domenica")
+
+# (ordinal day, (today, tomorrow, weekday)) for the current local day
+_date_cache: tuple[int, tuple[str, str, str]] | None = None
+
+
+def _date_strings() -> tuple[str, str, str]:
+    """Today/tomorrow as YYYY-MM-DD plus the Italian weekday, formatted once per day."""
+    global _date_cache
+    now = datetime.now()
+    day = now.toordinal()
+    if _date_cache is None or _date_cache[0] != day:
+        tm = now + timedelta(days=1)
+        values = (
+            f"{now.year:04d}-{now.month:02d}-{now.day:02d}",
+            f"{tm.year:04d}-{tm.month:02d}-{tm.day:02d}",
+            WEEKDAY_NAMES[now.weekday()],
+        )
+        _date_cache = (day, values)
+    return _date_cache[1]
+
+
+# Step 1.5 intent keywords. Only a leading word boundary, so inflected forms still match
+# ("eliminalo", "cancellare") as with the previous substring checks
+_READ_ONLY_RE = re.compile(
+    r"\b(?:agenda|programma|eventi|appuntamenti|cosa ho|che ho|mostra|fammi vedere|quali|cosa c'è)"
+)
+_WANTS_ACTION_RE = re.compile(
+    r"\b(?:cancella|elimina|rimuovi|sposta|modifica|cambia|aggiorna|delete|remove|update)"
+)
+
+# Deterministic routing for the most common read-only phrasings ("agenda domani",
+# "cosa ho oggi?", "che eventi ho domani"): no LLM round-trip needed
+_FAST_AGENDA_RE = re.compile(
+    r"(?:(?:mostrami |fammi vedere )?(?:la mia |l')?(?:agenda|programma|eventi|appuntamenti|impegni)"
+    r"|(?:cosa|che cosa|che) (?:ho|c'è)(?: in (?:agenda|programma))?"
+    r"|che (?:eventi|appuntamenti|impegni) ho)"
+    r"(?: (?:di|per|in))? (?P<day>oggi|domani|questa settimana)[?!. ]*"
+)
+
+
+# Words that point back at the conversation ("spostalo", "quello delle 10", "sì")
+_CONTEXT_TRIGGERS = frozenset({
+    "lo", "la", "li", "le", "gli", "ne",
+    "quello", "quella", "quelli", "quelle", "questo", "questa", "stesso", "stessa",
+    "spostalo", "spostala", "spostali", "cambialo", "cambiala", "modificalo", "modificala",
+    "eliminalo", "eliminala", "eliminali", "cancellalo", "cancellala", "cancellali",
+    "anche", "invece", "sì", "si", "ok",
+})
+_WORD_RE = re.compile(r"\w+")
+
+
+def _needs_context(user_input: str) -> bool:
+    """True when the request is short or refers back to earlier turns, so the history is worth its tokens."""
+    words = _WORD_RE.findall(user_input.lower())
+    return len(words) < 4 or not _CONTEXT_TRIGGERS.isdisjoint(words)
+
+
+_MSG_FIELDS = attrgetter("type", "content")
+
+
+def _render_turns(messages: list) -> str:
+    """Render chat messages as 'Utente: ...' / 'Assistente: ...' lines."""
+    lines = []
+    for msg in messages:
+        try:
+            msg_type, content = _MSG_FIELDS(msg)
+        except AttributeError:
+            continue
+        lines.append(f"{'Utente' if msg_type == 'human' else 'Assistente'}: {content}")
+    return "\n".join(lines)
+
+
+def _fast_route(user_input: str, today: str, tomorrow: str) -> dict | None:
+    """Return a get_events decision for trivial agenda requests, None to defer to the LLM."""
+    match = _FAST_AGENDA_RE.fullmatch(" ".join(user_input.lower().split()))
+    if not match:
+        return None
+    if match["day"] == "questa settimana":
+        # From today through Sunday
+        start = _parse_date(today)
+        sunday = start + timedelta(days=6 - start.weekday())
+        return {
+            "tool": "get_events",
+            "params": {"start_date": today, "end_date": f"{sunday.year:04d}-{sunday.month:02d}-{sunday.day:02d}"},
+        }
+    day = today if match["day"] == "oggi" else tomorrow
+    return {"tool": "get_events", "params": {"start_date": day, "end_date": day}}
+
+
+# Delete vs. edit verbs, to resolve a single-match action without the step-2 LLM call
+_DELETE_RE = re.compile(r"\b(?:cancell|elimin|rimuov|delete|remove)")
+_EDIT_RE = re.compile(r"\b(?:sposta|modific|cambia|aggiorna|update)")
+
+
+def _title_matches_request(title: str, query: str, request_lower: str) -> bool:
+    """True when every word of the search query is in both the event title and the request."""
+    words = _WORD_RE.findall(query.lower())
+    if not words:
+        return False
+    title_lower = title.lower()
+    return all(word in title_lower and word in request_lower for word in words)
+
+# Placeholder ids the model sometimes emits instead of a real event id
+_FOUND_PLACEHOLDERS = frozenset({"FOUND_EVENT_ID", "{FOUND_EVENT_ID}", "$FOUND_EVENT_ID", "<FOUND_EVENT_ID>", "EVENT_ID"})
 
-Rispondi SOLO con JSON."""
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_TIME_RE = re.compile(r"\d{2}:\d{2}")
+
+
+def _parse_date(date: str, hour: int = 0, minute: int = 0) -> datetime:
+    """Build a datetime from a YYYY-MM-DD string without going through the generic ISO parser."""
+    if _DATE_RE.fullmatch(date):
+        return datetime(int(date[0:4]), int(date[5:7]), int(date[8:10]), hour, minute)
+    return datetime.fromisoformat(date).replace(hour=hour, minute=minute, second=0, microsecond=0)
+
+
+def _parse_datetime(date: str, time: str) -> datetime:
+    """Build a datetime from YYYY-MM-DD and HH:MM strings (generic ISO parser as fallback)."""
+    if _TIME_RE.fullmatch(time):
+        return _parse_date(date, int(time[0:2]), int(time[3:5]))
+    return datetime.fromisoformat(f"{date}T{time}")
+
+
+def _format_event_time(value: Any, with_date: bool) -> str:
+    """Render an event ISO timestamp as 'dd/mm HH:MM' (or 'HH:MM') by slicing the string."""
+    if not isinstance(value, str) or "T" not in value:
+        return str(value)
+    if len(value) >= 16 and value[10] == "T":
+        return f"{value[8:10]}/{value[5:7]} {value[11:16]}" if with_date else value[11:16]
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return dt.strftime("%d/%m %H:%M" if with_date else "%H:%M")
+
+
+def _discard_task(task: asyncio.Task) -> None:
+    """Cancel a task nobody will await; if it already failed, mark its exception as retrieved."""
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled():
+        task.exception()
+
+
+def _events_on_day(events: list[dict], day: str) -> list[dict]:
+    """Keep the events overlapping a YYYY-MM-DD day, comparing the events' own local dates."""
+    selected = []
+    for event in events:
+        start, end = event.get("start"), event.get("end")
+        if not isinstance(start, str) or not isinstance(end, str):
+            continue
+        # All-day events carry an exclusive end date, timed ones an inclusive end timestamp
+        ends_after = end[:10] >= day if "T" in end else end[:10] > day
+        if start[:10] <= day and ends_after:
+            selected.append(event)
+    return selected
+
+
+# Step-1 decisions only depend on the input, the date and the prompt/tool schema:
+# bump the key whenever either changes so stale decisions are never reused
+_DECISION_CACHE_VERSION = hashlib.sha1(
+    AGENT_SYSTEM_PROMPT.encode() + orjson.dumps(CALENDAR_FUNCTIONS, option=orjson.OPT_SORT_KEYS)
+).hexdigest()[:8]
+
+
+def _normalize_input(text: str) -> str:
+    """Lowercase, collapse whitespace and drop quotes so trivial rephrasings share a cache key."""
+    return " ".join(text.lower().replace('"', "").replace("'", " ").split())
 
 
 class CalendarAgent(BaseAgent):
     name = "calendar"
     resource_type = None  # Disable caching
 
+    # Tool name -> handler method; every handler takes (params, user_id)
+    _TOOL_METHODS = {
+        "get_events": "_tool_get_events",
+        "search_events": "_tool_search_events",
+        "create_event": "_tool_create_event",
+        "update_event": "_tool_update_event",
+        "delete_event": "_tool_delete_event",
+        "find_free_slots": "_tool_find_free_slots",
+    }
+    # Tools that change the calendar (invalidate cached event windows)
+    _WRITE_TOOLS = frozenset({"create_event", "update_event", "delete_event"})
+
+    def __init__(self):
+        super().__init__()
+        # Strong refs to fire-and-forget tasks so they are not garbage-collected mid-run
+        self._bg_tasks: set[asyncio.Task] = set()
+        # (user_id, email) -> monotonic deadline before the attendee is enriched again
+        self._recent_attendees: dict[tuple[str, str], float] = {}
+        # (id, title, start, end) of an event list -> its LLM rendering
+        self._format_cache: dict[tuple, str] = {}
+        # Redis key of an event window -> (monotonic expiry, events), checked before Redis
+        self._events_local: dict[str, tuple[float, list[dict]]] = {}
+        # Redis key -> in-flight fetch, so concurrent misses share one Google call
+        self._events_inflight: dict[str, asyncio.Future] = {}
+        # Created with its workers on first use (needs a running loop)
+        self._enrich_queue: asyncio.Queue | None = None
+        # Bound handlers resolved once instead of a getattr per tool call
+        self._tool_handlers = {name: getattr(self, method) for name, method in self._TOOL_METHODS.items()}
+
+    def _spawn_background(self, coro) -> None:
+        """Run a coroutine off the critical path, keeping a reference until it completes."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+
+    def _queue_enrichment(self, user_id: str, events: list[dict]) -> None:
+        """Hand events to the enrichment workers; drop them if the queue is full."""
+        if self._enrich_queue is None:
+            self._enrich_queue = asyncio.Queue(maxsize=ENRICH_QUEUE_SIZE)
+            for _ in range(ENRICH_WORKERS):
+                self._spawn_background(self._enrich_worker())
+        try:
+            self._enrich_queue.put_nowait((user_id, events))
+        except asyncio.QueueFull:
+            self.logger.warning("Enrichment queue full, skipping %s events", len(events))
+
+    async def _enrich_worker(self) -> None:
+        """Process queued attendee enrichments one batch at a time."""
+        while True:
+            user_id, events = await self._enrich_queue.get()
+            try:
+                await self._enrich_entities_from_events(user_id, events)
+            finally:
+                self._enrich_queue.task_done()
+
     async def _enrich_entities_from_events(self, user_id: str, events: list[dict]) -> None:
         """Extract person entities from calendar event attendees (background task)."""
         try:
+            now = time.monotonic()
+
+            # Pass 1: unique valid attendees, skipping the ones handled recently
+            pending: dict[str, tuple[str, str, str]] = {}
             for event in events:
                 attendees = event.get("attendees", [])
                 event_id = event.get("id")
 
                 for email in attendees:
-                    if not email or "@" not in email:
+                    if not email or "@" not in email or email in pending:
+                        continue
+                    if self._recent_attendees.get((user_id, email), 0) > now:
                         continue
 
-                    local_part = email.split("@")[0]
-                    name_parts = local_part.replace(".", " ").replace("_", " ").replace("-", " ").split()
-                    canonical_name = " ".join(p.capitalize() for p in name_parts)
-
-                    if len(canonical_name) < 3 or canonical_name.lower() in ["info", "support", "admin", "noreply"]:
+                    canonical = _canonicalize_email(email)
+                    if canonical is None:
                         continue
 
-                    embedding = await openai_embeddings.embed(canonical_name)
-                    entity = await KGEntityRepository.create_entity(
-                        user_id=user_id,
-                        canonical_name=canonical_name,
-                        entity_type="person",
-                        properties={"email": email, "source": "calendar"},
-                        embedding=embedding,
-                        confidence=0.6,
-                        source_type="calendar",
-                        source_id=event_id
-                    )
+                    canonical_name, local_part = canonical
+                    pending[email] = (event_id, local_part, canonical_name)
+
+            if not pending:
+                return
+
+            # Pass 2: one query for the people already in the graph
+            names = list(dict.fromkeys(t[2] for t in pending.values()))
+            existing = await KGEntityRepository.get_entities_by_names(user_id, names, "person")
+
+            # Pass 3: one embeddings request for the new names only
+            new_names = [name for name in names if name not in existing]
+            vectors = await openai_embeddings.embed_batch(new_names) if new_names else []
+            vec_by_name = dict(zip(new_names, vectors))
+
+            coros = []
+            for email, (event_id, local_part, name) in pending.items():
+                if name in existing:
+                    coros.append(self._touch_attendee_entity(existing[name]["id"], email))
+                else:
+                    coros.append(self._save_attendee_entity(
+                        user_id, event_id, email, local_part, name, vec_by_name[name]
+                    ))
+
+            results = await asyncio.gather(*coros, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.warning("Failed to save attendee entity: %s", result)
+
+            expires = now + ATTENDEE_REFRESH_SECONDS
+            for email in pending:
+                self._recent_attendees[(user_id, email)] = expires
+            if len(self._recent_attendees) > 2048:
+                self._recent_attendees = {k: v for k, v in self._recent_attendees.items() if v > now}
+
+        except Exception as e:
+            self.logger.warning("Failed to enrich entities: %s", e)
+
+    async def _touch_attendee_entity(self, entity_id: str, email: str) -> None:
+        """Record a new mention of a known person and make sure the email is an alias."""
+        await asyncio.gather(
+            KGEntityRepository.update_mention(entity_id),
+            KGAliasRepository.add_alias(entity_id, email, confidence=0.9),
+        )
+
+    async def _save_attendee_entity(
+        self,
+        user_id: str,
+        event_id: str,
+        email: str,
+        local_part: str,
+        canonical_name: str,
+        embedding: list[float]
+    ) -> None:
+        """Create the person entity for an attendee, or attach the email to the existing one."""
+        entity = await KGEntityRepository.create_entity(
+            user_id=user_id,
+            canonical_name=canonical_name,
+            entity_type="person",
+            properties={"email": email, "source": "calendar"},
+            embedding=embedding,
+            confidence=0.6,
+            source_type="calendar",
+            source_id=event_id
+        )
+
+        if entity:
+            await asyncio.gather(
+                KGAliasRepository.add_alias(entity["id"], email, confidence=0.9),
+                KGAliasRepository.add_alias(entity["id"], local_part, confidence=0.7),
+            )
+        else:
+            existing = await KGEntityRepository.get_entity_by_name(user_id, canonical_name, "person")
+            if existing:
+                await self._touch_attendee_entity(existing["id"], email)
+
+    def _decision_cache_key(self, user_id: str, full_input: str, today: str) -> str:
+        digest = hashlib.sha1(_normalize_input(full_input).encode()).hexdigest()
+        return f"jarvis:cache:calendar_decision:{user_id}:{today}:{_DECISION_CACHE_VERSION}:{digest}"
 
-                    if entity:
-                        await KGAliasRepository.add_alias(entity["id"], email, confidence=0.9)
-                        await KGAliasRepository.add_alias(entity["id"], local_part, confidence=0.7)
-                    else:
-                        existing = await KGEntityRepository.get_entity_by_name(user_id, canonical_name, "person")
-                        if existing:
-                            await KGEntityRepository.update_mention(existing["id"])
-                            await KGAliasRepository.add_alias(existing["id"], email, confidence=0.9)
+    async def _get_cached_decision(self, key: str) -> dict | list | None:
+        try:
+            return await redis_client.get(key)
+        except Exception as e:
+            self.logger.warning("Decision cache read failed: %s", e)
+            return None
 
+    async def _set_cached_decision(self, key: str, decision: dict | list) -> None:
+        try:
+            await redis_client.set(key, decision, get_settings().cache_ttl_llm_decision)
         except Exception as e:
-            self.logger.warning(f"Failed to enrich entities: {e}")
+            self.logger.warning("Decision cache write failed: %s", e)
 
     def _format_events_for_llm(self, events: list[dict]) -> str:
         """Format events list for LLM consumption with clear IDs."""
         if not events:
             return "Nessun evento trovato."
 
-        lines = []
-        for ev in events:
-            event_id = ev.get("id", "???")
-            title = ev.get("title", "Senza titolo")
-            start = ev.get("start", "")
-            end = ev.get("end", "")
-
-            # Format datetime nicely
-            if isinstance(start, str) and "T" in start:
-                start_dt = datetime.fromisoformat(start.replace("Z", "+00:00"))
-                start_str = start_dt.strftime("%d/%m %H:%M")
-            else:
-                start_str = str(start)
-
-            if isinstance(end, str) and "T" in end:
-                end_dt = datetime.fromisoformat(end.replace("Z", "+00:00"))
-                end_str = end_dt.strftime("%H:%M")
-            else:
-                end_str = str(end)
+        key = tuple((ev.get("id"), ev.get("title"), ev.get("start"), ev.get("end")) for ev in events)
+        cached = self._format_cache.get(key)
+        if cached is not None:
+            return cached
 
-            lines.append(f"- [{event_id}] \"{title}\" ({start_str}-{end_str})")
+        lines = [
+            f"- [{ev.get('id', '???')}] \"{ev.get('title', 'Senza titolo')}\" "
+            f"({_format_event_time(ev.get('start', ''), True)}-{_format_event_time(ev.get('end', ''), False)})"
+            for ev in events
+        ]
 
-        return "\n".join(lines)
+        formatted = "\n".join(lines)
+        if len(self._format_cache) >= 128:
+            # Drop the oldest entry (dicts keep insertion order)
+            del self._format_cache[next(iter(self._format_cache))]
+        self._format_cache[key] = formatted
+        return formatted
 
     async def _execute(self, state: JarvisState) -> Any:
         """Execute calendar operations with intelligent two-step workflow."""
@@ -235,34 +609,16 @@ class CalendarAgent(BaseAgent):
         messages = state.get("messages", [])
         self._current_user_id = user_id
 
-        # Build conversation context
+        # Build conversation context, only for requests that refer back to it
         conversation_context = ""
-        if len(messages) > 1:
-            recent = messages[-5:-1] if len(messages) > 5 else messages[:-1]
-            context_parts = []
-            for msg in recent:
-                role = "Utente" if hasattr(msg, 'type') and msg.type == "human" else "Assistente"
-                if hasattr(msg, 'content'):
-                    context_parts.append(f"{role}: {msg.content}")
-            if context_parts:
-                conversation_context = "\n".join(context_parts)
+        if _needs_context(user_input):
+            conversation_context = _render_turns(messages[max(0, len(messages) - 5):-1])
 
         # Date info
-        now = datetime.now()
-        today = now.strftime("%Y-%m-%d")
-        tomorrow = (now + timedelta(days=1)).strftime("%Y-%m-%d")
-        weekday_names = ["Lunedì", "Martedì", "Mercoledì", "Giovedì", "Venerdì", "Sabato", "Domenica"]
-        weekday = weekday_names[now.weekday()]
-
-        tools_str = json.dumps(CALENDAR_TOOLS, indent=2, ensure_ascii=False)
+        today, tomorrow, weekday = _date_strings()
 
         # Build prompt
-        prompt = AGENT_SYSTEM_PROMPT.format(
-            today=today,
-            tomorrow=tomorrow,
-            weekday=weekday,
-            tools=tools_str
-        )
+        prompt = _system_prompt(today, tomorrow, weekday)
 
         # Build input with context
         if conversation_context:
@@ -270,36 +626,94 @@ class CalendarAgent(BaseAgent):
         else:
             full_input = user_input
 
-        # STEP 1: Ask LLM what to do
-        self.logger.info(f"Calendar agent: analyzing request")
-        response = await gemini.generate(
-            full_input,
-            system_instruction=prompt,
-            model="gemini-2.5-flash",
-            temperature=0.1
-        )
-
-        # Parse response
-        try:
-            decision = self._parse_json_response(response)
-        except Exception as e:
-            self.logger.error(f"Failed to parse LLM response: {response[:200]}")
-            return {"error": f"Non ho capito la richiesta: {str(e)}"}
+        # STEP 1: Decide what to do: deterministic fast route, cached decision, then LLM
+        prefetch = None
+        decision = _fast_route(user_input, today, tomorrow)
+        if decision is not None:
+            self.logger.info("Calendar agent: fast route")
+        else:
+            cache_key = self._decision_cache_key(user_id, full_input, today)
+            decision = await self._get_cached_decision(cache_key)
+            if decision is not None:
+                self.logger.info("Calendar agent: reusing cached decision")
+            else:
+                self.logger.info("Calendar agent: analyzing request")
+                # Most requests read today/tomorrow: start that fetch while the LLM decides
+                if user_id and get_settings().calendar_speculative_prefetch:
+                    prefetch = asyncio.create_task(
+                        self._fetch_events(user_id, _parse_date(today), _parse_date(tomorrow, 23, 59))
+                    )
+                try:
+                    decision = await self._decide(full_input, prompt, CALENDAR_FUNCTIONS)
+                    await self._set_cached_decision(cache_key, decision)
+                except BaseException:
+                    # Do not leave the speculative fetch running unobserved
+                    if prefetch is not None:
+                        _discard_task(prefetch)
+                    raise
+
+        prefetched = None
+        if prefetch is not None:
+            prefetched = await self._use_prefetch(prefetch, decision, today, tomorrow, user_id)
 
         # Handle list of operations (multiple create_event)
         if isinstance(decision, list):
-            results = []
             for op in decision:
-                tool_name = op.get("tool")
-                params = op.get("params", {})
-                self.logger.info(f"Calendar agent: {tool_name} with {params}")
-                result = await self._execute_tool(tool_name, params)
-                results.append(result)
+                self.logger.info("Calendar agent: %s with %s", op.get("tool"), op.get("params", {}))
+            # Several create_event (or delete_event) go out as one batch HTTP request
+            create_indexes = [i for i, op in enumerate(decision) if op.get("tool") == "create_event"]
+            if len(create_indexes) < 2:
+                create_indexes = []
+            delete_indexes = [i for i, op in enumerate(decision) if op.get("tool") == "delete_event"]
+            if len(delete_indexes) < 2:
+                delete_indexes = []
+            batched = set(create_indexes).union(delete_indexes)
+            other_indexes = [i for i in range(len(decision)) if i not in batched]
+
+            # Identical searches in one decision share a single search -> action workflow
+            searches: dict[bytes, asyncio.Future] = {}
+
+            def run_op(op: dict):
+                tool, op_params = op.get("tool"), op.get("params", {})
+                if tool not in ("get_events", "search_events"):
+                    return self._execute_tool(tool, op_params)
+                key = orjson.dumps([tool, op_params], option=orjson.OPT_SORT_KEYS)
+                if key not in searches:
+                    searches[key] = asyncio.ensure_future(self._search_then_act(
+                        tool, op_params, user_input, conversation_context, today, weekday
+                    ))
+                return searches[key]
+
+            # Operations are independent: the batches and the remaining calls (each search with
+            # its own follow-up action) run concurrently
+            create_results, delete_results, *other_results = await asyncio.gather(
+                self._batch_create_events([decision[i].get("params", {}) for i in create_indexes]),
+                self._batch_delete_events([decision[i].get("params", {}) for i in delete_indexes]),
+                *(run_op(decision[i]) for i in other_indexes),
+                return_exceptions=True
+            )
+
+            results = [None] * len(decision)
+            for indexes, group in (
+                (create_indexes, create_results),
+                (delete_indexes, delete_results),
+                (other_indexes, other_results),
+            ):
+                if isinstance(group, BaseException):
+                    group = [group] * len(indexes)
+                for i, r in zip(indexes, group):
+                    results[i] = r
+            results = [
+                {"error": f"Errore: {str(r)}"} if isinstance(r, BaseException) else r
+                for r in results
+            ]
+            if not results:
+                return {"message": "Nessuna azione necessaria"}
             return {"multiple_results": results} if len(results) > 1 else results[0]
 
         tool_name = decision.get("tool")
         params = decision.get("params", {})
-        self.logger.info(f"Calendar agent: {tool_name} with {params}")
+        self.logger.info("Calendar agent: %s with %s", tool_name, params)
 
         # If tool is none, return message
         if tool_name == "none":
@@ -307,105 +721,243 @@ class CalendarAgent(BaseAgent):
 
         # STEP 1.5: If it's a search/get that might need follow-up, execute and check
         if tool_name in ("get_events", "search_events"):
-            search_result = await self._execute_tool(tool_name, params)
-            events = search_result.get("events", [])
-
-            # Check if user just wanted to see events (not modify/delete)
-            request_lower = user_input.lower()
-            is_read_only = any(word in request_lower for word in [
-                "agenda", "programma", "eventi", "appuntamenti", "cosa ho",
-                "che ho", "mostra", "fammi vedere", "quali", "cosa c'è"
-            ])
-            wants_action = any(word in request_lower for word in [
-                "cancella", "elimina", "rimuovi", "sposta", "modifica",
-                "cambia", "aggiorna", "delete", "remove", "update"
-            ])
-
-            if is_read_only and not wants_action:
-                # User just wanted to see events
-                return search_result
-
-            if not events:
-                return search_result  # No events found, return as-is
-
-            # STEP 2: We have events and user wants to do something - ask LLM to pick
-            self.logger.info(f"Calendar agent: step 2 - choosing from {len(events)} events")
-
-            events_formatted = self._format_events_for_llm(events)
-            followup_prompt = FOLLOWUP_PROMPT.format(
-                today=today,
-                weekday=weekday,
-                original_request=user_input,
-                events_list=events_formatted,
-                tools=tools_str
-            )
-
-            followup_response = await gemini.generate(
-                f"Richiesta originale: {user_input}\n\nContesto: {conversation_context}" if conversation_context else user_input,
-                system_instruction=followup_prompt,
-                model="gemini-2.5-flash",
-                temperature=0.1
+            return await self._search_then_act(
+                tool_name, params, user_input, conversation_context, today, weekday, prefetched
             )
 
-            try:
-                followup_decision = self._parse_json_response(followup_response)
-            except Exception as e:
-                self.logger.error(f"Failed to parse followup response: {followup_response[:200]}")
-                return search_result  # Return search results if we can't parse followup
-
-            followup_tool = followup_decision.get("tool")
-            followup_params = followup_decision.get("params", {})
-
-            if followup_tool == "none":
-                return search_result
-
-            # Validate event_id exists
-            if followup_tool in ("update_event", "delete_event"):
-                event_id = followup_params.get("event_id")
-                if not event_id or event_id == "FOUND_EVENT_ID":
-                    self.logger.error(f"LLM returned invalid event_id: {event_id}")
-                    return {"error": "Non sono riuscito a identificare l'evento corretto", "events": events}
+        # Direct execution for create_event, etc.
+        return await self._execute_tool(tool_name, params)
 
-                # Verify event_id is in our results
-                valid_ids = [e.get("id") for e in events]
-                if event_id not in valid_ids:
-                    self.logger.warning(f"LLM returned event_id {event_id} not in results {valid_ids}")
-                    # Still try to execute - maybe it's a valid ID from context
+    async def _search_then_act(
+        self,
+        tool_name: str,
+        params: dict,
+        user_input: str,
+        conversation_context: str,
+        today: str,
+        weekday: str,
+        prefetched: dict | None = None
+    ) -> dict:
+        """Run a get/search call and, when the request asks for it, the step-2 action on its results."""
+        search_result = prefetched or await self._execute_tool(tool_name, params)
+        events = search_result.get("events", [])
+
+        # Check if user just wanted to see events (not modify/delete)
+        request_lower = user_input.lower()
+        is_read_only = _READ_ONLY_RE.search(request_lower) is not None
+        wants_action = _WANTS_ACTION_RE.search(request_lower) is not None
+
+        if is_read_only and not wants_action:
+            # User just wanted to see events
+            return search_result
 
-            self.logger.info(f"Calendar agent step 2: {followup_tool} with {followup_params}")
-            return await self._execute_tool(followup_tool, followup_params)
+        if not events:
+            return search_result  # No events found, return as-is
+
+        # Exactly one title match for a plain delete request: nothing for the LLM to choose.
+        # get_events returns the whole date window, not matches, so it always goes through
+        # step 2 (which can decline); edits do too, step 2 extracts the new values.
+        if (
+            wants_action
+            and tool_name == "search_events"
+            and len(events) == 1
+            and _title_matches_request(events[0].get("title") or "", params.get("query") or "", request_lower)
+            and _DELETE_RE.search(request_lower)
+            and not _EDIT_RE.search(request_lower)
+        ):
+            self.logger.info("Calendar agent: single match, deleting %s", events[0].get("id"))
+            return await self._execute_tool("delete_event", {"event_id": events[0].get("id")})
+
+        # STEP 2: We have events and user wants to do something - ask LLM to pick
+        self.logger.info("Calendar agent: step 2 - choosing from %s events", len(events))
+
+        events_formatted = self._format_events_for_llm(events)
+        followup_prompt = FOLLOWUP_PROMPT.format(
+            today=today,
+            weekday=weekday,
+            original_request=user_input,
+            events_list=events_formatted
+        )
 
-        # Direct execution for create_event, etc.
-        return await self._execute_tool(tool_name, params)
+        followup_decision = await self._decide(
+            f"Richiesta originale: {user_input}\n\nContesto: {conversation_context}" if conversation_context else user_input,
+            followup_prompt,
+            FOLLOWUP_FUNCTIONS
+        )
+        if isinstance(followup_decision, list):
+            followup_decision = followup_decision[0]
+
+        followup_tool = followup_decision.get("tool")
+        followup_params = followup_decision.get("params", {})
+
+        if followup_tool == "none":
+            return search_result
+
+        # Validate event_id exists
+        if followup_tool in ("update_event", "delete_event"):
+            event_id = followup_params.get("event_id")
+            if not event_id or str(event_id).strip().upper() in _FOUND_PLACEHOLDERS:
+                self.logger.error("LLM returned invalid event_id: %s", event_id)
+                return {"error": "Non sono riuscito a identificare l'evento corretto", "events": events}
+
+            # Verify event_id is in our results
+            valid_ids = [e.get("id") for e in events]
+            if event_id not in valid_ids:
+                self.logger.warning("LLM returned event_id %s not in results %s", event_id, valid_ids)
+                # Still try to execute - maybe it's a valid ID from context
+
+        self.logger.info("Calendar agent step 2: %s with %s", followup_tool, followup_params)
+        return await self._execute_tool(followup_tool, followup_params)
+
+    async def _decide(self, prompt: str, system_instruction: str, functions: list[dict]) -> dict | list:
+        """Ask Gemini which tool(s) to call.
+
+        Returns {"tool", "params"} for a single call, a list of them for several calls,
+        or {"tool": "none", "message"} when the model answered in text.
+        """
+        calls, text = await gemini.generate_with_tools(
+            prompt,
+            functions,
+            system_instruction=system_instruction,
+            model=_MODEL,
+            temperature=_TEMPERATURE
+        )
+        if not calls:
+            return {"tool": "none", "message": text.strip() or "Nessuna azione necessaria"}
+        return calls[0] if len(calls) == 1 else calls
+
+    async def _use_prefetch(
+        self,
+        prefetch: asyncio.Task,
+        decision: dict | list,
+        today: str,
+        tomorrow: str,
+        user_id: str
+    ) -> dict | None:
+        """Answer a get_events decision from the speculative today+tomorrow fetch, if it covers it.
+
+        Any other decision cancels the fetch, so a write never races with a late cache fill.
+        """
+        window = None
+        if isinstance(decision, dict) and decision.get("tool") == "get_events":
+            params = decision.get("params", {})
+            window = (params.get("start_date"), params.get("end_date"))
+        if window not in ((today, tomorrow), (today, today), (tomorrow, tomorrow)):
+            _discard_task(prefetch)
+            return None
 
-    def _parse_json_response(self, response: str) -> dict | list:
-        """Parse JSON from LLM response, handling markdown code blocks."""
-        clean = response.strip()
-        if clean.startswith("```"):
-            clean = clean.split("```")[1]
-            if clean.startswith("json"):
-                clean = clean[4:]
-            clean = clean.strip()
-        return json.loads(clean)
+        try:
+            events = await prefetch
+        except Exception as e:
+            self.logger.warning("Speculative events fetch failed: %s", e)
+            return None
+        if window[0] == window[1]:
+            events = _events_on_day(events, window[0])
+        self.logger.info("Calendar agent: get_events served by speculative fetch")
+        return self._events_result(window[0], window[1], events, user_id)
 
     async def _execute_tool(self, tool_name: str, params: dict) -> dict:
         """Execute the selected tool."""
+        handler = self._tool_handlers.get(tool_name)
+        if handler is None:
+            return {"error": f"Tool sconosciuto: {tool_name}"}
+
         user_id = getattr(self, "_current_user_id", None)
+        result = await handler(params, user_id)
+
+        if tool_name in self._WRITE_TOOLS and user_id and "error" not in result:
+            await self._invalidate_events_cache(user_id)
+        return result
+
+    async def _fetch_events(
+        self,
+        user_id: str | None,
+        start: datetime,
+        end: datetime,
+        max_results: int = 50,
+        query: str | None = None
+    ) -> list[dict]:
+        """Fetch events for a window, served from memory or Redis when the same window was read recently."""
+        if not user_id:
+            return await calendar_client.get_events_async(
+                start=start, end=end, max_results=max_results, query=query
+            )
+
+        key = (
+            f"jarvis:cache:calendar_events:{user_id}:{start.isoformat()}:{end.isoformat()}"
+            f":{max_results}:{query or ''}"
+        )
+        now = time.monotonic()
+        local = self._events_local.get(key)
+        if local is not None and local[0] > now:
+            return local[1]
 
-        if tool_name == "get_events":
-            return await self._tool_get_events(params, user_id)
-        elif tool_name == "search_events":
-            return await self._tool_search_events(params, user_id)
-        elif tool_name == "create_event":
-            return await self._tool_create_event(params)
-        elif tool_name == "update_event":
-            return await self._tool_update_event(params)
-        elif tool_name == "delete_event":
-            return await self._tool_delete_event(params)
-        elif tool_name == "find_free_slots":
-            return await self._tool_find_free_slots(params)
+        inflight = self._events_inflight.get(key)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                # The fetch we joined was cancelled (not us): load the window ourselves
+                if not inflight.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._events_inflight[key] = future
+        try:
+            events = await self._load_events(key, start, end, max_results, query)
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so a miss without waiters does not log "exception never retrieved"
+            future.exception()
+            raise
         else:
-            return {"error": f"Tool sconosciuto: {tool_name}"}
+            future.set_result(events)
+        finally:
+            # Cancelled mid-fetch: release the waiters instead of leaving them pending forever
+            if not future.done():
+                future.cancel()
+            if self._events_inflight.get(key) is future:
+                del self._events_inflight[key]
+
+        if len(self._events_local) >= 128:
+            self._events_local = {k: v for k, v in self._events_local.items() if v[0] > now}
+        self._events_local[key] = (now + EVENTS_LOCAL_TTL_SECONDS, events)
+        return events
+
+    async def _load_events(
+        self,
+        key: str,
+        start: datetime,
+        end: datetime,
+        max_results: int,
+        query: str | None
+    ) -> list[dict]:
+        """Read an event window from Redis, falling back to Google Calendar and filling Redis."""
+        try:
+            cached = await redis_client.get(key)
+        except Exception as e:
+            self.logger.warning("Events cache read failed: %s", e)
+            cached = None
+        if cached is not None:
+            return cached
+
+        events = await calendar_client.get_events_async(
+            start=start, end=end, max_results=max_results, query=query
+        )
+        try:
+            await redis_client.set(key, events, get_settings().cache_ttl_calendar)
+        except Exception as e:
+            self.logger.warning("Events cache write failed: %s", e)
+        return events
+
+    async def _invalidate_events_cache(self, user_id: str) -> None:
+        """Drop every cached event window for the user after a calendar write."""
+        prefix = f"jarvis:cache:calendar_events:{user_id}:"
+        self._events_local = {k: v for k, v in self._events_local.items() if not k.startswith(prefix)}
+        try:
+            await redis_client.flush_pattern(f"jarvis:cache:calendar_events:{user_id}:*")
+        except Exception as e:
+            self.logger.warning("Events cache invalidation failed: %s", e)
 
     async def _tool_get_events(self, params: dict, user_id: str = None) -> dict:
         """Get calendar events."""
@@ -413,48 +965,57 @@ class CalendarAgent(BaseAgent):
             start_date = params.get("start_date")
             end_date = params.get("end_date")
 
-            start = datetime.fromisoformat(f"{start_date}T00:00")
-            end = datetime.fromisoformat(f"{end_date}T23:59")
-
-            events = calendar_client.get_events(start=start, end=end)
-
-            if events and user_id:
-                asyncio.create_task(self._enrich_entities_from_events(user_id, events))
+            start = _parse_date(start_date)
+            end = _parse_date(end_date, 23, 59)
 
-            return {
-                "operation": "get_events",
-                "period": f"{start_date} - {end_date}",
-                "events": events,
-                "count": len(events)
-            }
+            events = await self._fetch_events(user_id, start, end)
+            return self._events_result(start_date, end_date, events, user_id)
         except Exception as e:
-            self.logger.error(f"get_events failed: {e}")
+            self.logger.error("get_events failed: %s", e)
             return {"error": f"Errore nel recupero eventi: {str(e)}"}
 
+    def _events_result(self, start_date: str, end_date: str, events: list[dict], user_id: str | None) -> dict:
+        """Shape a get_events result and enrich the attendees in the background."""
+        if events and user_id:
+            self._queue_enrichment(user_id, events)
+
+        return {
+            "operation": "get_events",
+            "period": f"{start_date} - {end_date}",
+            "events": events,
+            "count": len(events)
+        }
+
     async def _tool_search_events(self, params: dict, user_id: str = None) -> dict:
         """Search events by title/keyword."""
         try:
             query = params.get("query", "").lower()
-            now = datetime.now()
-
-            start_date = params.get("start_date", now.strftime("%Y-%m-%d"))
-            end_date = params.get("end_date", (now + timedelta(days=30)).strftime("%Y-%m-%d"))
-
-            start = datetime.fromisoformat(f"{start_date}T00:00")
-            end = datetime.fromisoformat(f"{end_date}T23:59")
-
-            all_events = calendar_client.get_events(start=start, end=end, max_results=100)
-
-            # Filter by query
-            matching = []
-            for event in all_events:
-                title = (event.get("title") or "").lower()
-                description = (event.get("description") or "").lower()
-                if query in title or query in description:
-                    matching.append(event)
+            start_date = params.get("start_date")
+            end_date = params.get("end_date")
+            if not start_date or not end_date:
+                now = datetime.now()
+                later = now + timedelta(days=30)
+                start_date = start_date or f"{now.year:04d}-{now.month:02d}-{now.day:02d}"
+                end_date = end_date or f"{later.year:04d}-{later.month:02d}-{later.day:02d}"
+
+            start = _parse_date(start_date)
+            end = _parse_date(end_date, 23, 59)
+
+            if len(query) >= 3:
+                # Let Google do the full-text match instead of scanning the whole window
+                matching = await self._fetch_events(user_id, start, end, max_results=100, query=query)
+            else:
+                # Too short for a meaningful server-side search: substring filter locally
+                all_events = await self._fetch_events(user_id, start, end, max_results=100)
+                matching = []
+                for event in all_events:
+                    title = (event.get("title") or "").lower()
+                    description = (event.get("description") or "").lower()
+                    if query in title or query in description:
+                        matching.append(event)
 
             if matching and user_id:
-                asyncio.create_task(self._enrich_entities_from_events(user_id, matching))
+                self._queue_enrichment(user_id, matching)
 
             return {
                 "operation": "search_events",
@@ -464,64 +1025,101 @@ class CalendarAgent(BaseAgent):
                 "message": f"Trovati {len(matching)} eventi" if matching else f"Nessun evento trovato con '{query}'"
             }
         except Exception as e:
-            self.logger.error(f"search_events failed: {e}")
+            self.logger.error("search_events failed: %s", e)
             return {"error": f"Errore nella ricerca: {str(e)}"}
 
-    async def _tool_create_event(self, params: dict) -> dict:
-        """Create a calendar event."""
-        try:
-            start_date = params.get("start_date") or params.get("date")
-            end_date = params.get("end_date") or start_date
-            start_time = params.get("start_time")
-            end_time = params.get("end_time")
-            title = params.get("title", "Evento")
+    def _create_event_kwargs(self, params: dict) -> dict:
+        """Translate create_event tool params into calendar_client.create_event arguments."""
+        start_date = params.get("start_date") or params.get("date")
+        end_date = params.get("end_date") or start_date
 
-            start = datetime.fromisoformat(f"{start_date}T{start_time}")
-            end = datetime.fromisoformat(f"{end_date}T{end_time}")
+        attendees_raw = params.get("attendees", "")
+        # Any separator works: "a@x.com, b@y.com" as well as "a@x.com e b@y.com"
+        attendees = _EMAIL_RE.findall(attendees_raw) if attendees_raw else None
 
-            attendees_raw = params.get("attendees", "")
-            attendees = None
-            if attendees_raw:
-                attendees = [e.strip() for e in attendees_raw.split(",") if e.strip() and "@" in e]
+        add_meet_param = params.get("add_meet")
+        if isinstance(add_meet_param, str):
+            add_meet = add_meet_param.lower() == "true"
+        elif isinstance(add_meet_param, bool):
+            add_meet = add_meet_param
+        else:
+            add_meet = bool(attendees)
+
+        return {
+            "title": params.get("title", "Evento"),
+            "start": _parse_datetime(start_date, params.get("start_time")),
+            "end": _parse_datetime(end_date, params.get("end_time")),
+            "description": params.get("description"),
+            "location": params.get("location"),
+            "attendees": attendees,
+            "add_meet": add_meet,
+        }
 
-            add_meet_param = params.get("add_meet")
-            if isinstance(add_meet_param, str):
-                add_meet = add_meet_param.lower() == "true"
-            elif isinstance(add_meet_param, bool):
-                add_meet = add_meet_param
-            else:
-                add_meet = bool(attendees)
+    def _create_event_result(self, params: dict, kwargs: dict, event: dict) -> dict:
+        """Build the create_event tool result for a created event."""
+        start_date = params.get("start_date") or params.get("date")
+        end_date = params.get("end_date") or start_date
+        start_time = params.get("start_time")
+        end_time = params.get("end_time")
 
-            event = calendar_client.create_event(
-                title=title,
-                start=start,
-                end=end,
-                description=params.get("description"),
-                location=params.get("location"),
-                attendees=attendees,
-                add_meet=add_meet
-            )
+        if start_date == end_date:
+            message = f"Evento '{event['title']}' creato per {start_date} {start_time}-{end_time}"
+        else:
+            message = f"Evento '{event['title']}' creato da {start_date} {start_time} a {end_date} {end_time}"
 
-            if start_date == end_date:
-                message = f"Evento '{event['title']}' creato per {start_date} {start_time}-{end_time}"
-            else:
-                message = f"Evento '{event['title']}' creato da {start_date} {start_time} a {end_date} {end_time}"
+        if kwargs["attendees"]:
+            message += f" con {len(kwargs['attendees'])} partecipanti"
+        if event.get("meet_link"):
+            message += f"\n📹 Meet: {event['meet_link']}"
 
-            if attendees:
-                message += f" con {len(attendees)} partecipanti"
-            if event.get("meet_link"):
-                message += f"\n📹 Meet: {event['meet_link']}"
+        return {
+            "operation": "create_event",
+            "event": event,
+            "message": message
+        }
 
-            return {
-                "operation": "create_event",
-                "event": event,
-                "message": message
-            }
+    async def _tool_create_event(self, params: dict, user_id: str = None) -> dict:
+        """Create a calendar event."""
+        try:
+            kwargs = self._create_event_kwargs(params)
+            event = await _run_calendar(calendar_client.create_event, **kwargs)
+            return self._create_event_result(params, kwargs, event)
         except Exception as e:
-            self.logger.error(f"create_event failed: {e}")
+            self.logger.error("create_event failed: %s", e)
             return {"error": f"Errore nella creazione: {str(e)}"}
 
-    async def _tool_update_event(self, params: dict) -> dict:
+    async def _batch_create_events(self, params_list: list[dict]) -> list[dict]:
+        """Create several events with one batch request; results keep the input order."""
+        results: list[dict | None] = [None] * len(params_list)
+        prepared = []
+        for index, params in enumerate(params_list):
+            try:
+                prepared.append((index, params, self._create_event_kwargs(params)))
+            except Exception as e:
+                self.logger.error("create_event failed: %s", e)
+                results[index] = {"error": f"Errore nella creazione: {str(e)}"}
+
+        if prepared:
+            try:
+                events = await _run_calendar(
+                    calendar_client.batch_create_events, [kwargs for _, _, kwargs in prepared]
+                )
+            except Exception as e:
+                events = [e] * len(prepared)
+
+            for (index, params, kwargs), event in zip(prepared, events):
+                if isinstance(event, Exception):
+                    self.logger.error("create_event failed: %s", event)
+                    results[index] = {"error": f"Errore nella creazione: {str(event)}"}
+                else:
+                    results[index] = self._create_event_result(params, kwargs, event)
+
+        user_id = getattr(self, "_current_user_id", None)
+        if user_id and any("error" not in r for r in results):
+            await self._invalidate_events_cache(user_id)
+        return results
+
+    async def _tool_update_event(self, params: dict, user_id: str = None) -> dict:
         """Update an existing calendar event."""
         try:
             event_id = params.get("event_id")
@@ -543,20 +1141,20 @@ class CalendarAgent(BaseAgent):
             end_time = params.get("end_time")
 
             if start_date and start_time:
-                updates["start"] = datetime.fromisoformat(f"{start_date}T{start_time}")
+                updates["start"] = _parse_datetime(start_date, start_time)
             elif start_time:
-                updates["start"] = datetime.fromisoformat(f"{datetime.now().strftime('%Y-%m-%d')}T{start_time}")
+                updates["start"] = _parse_datetime(_date_strings()[0], start_time)
 
             if end_date and end_time:
-                updates["end"] = datetime.fromisoformat(f"{end_date}T{end_time}")
+                updates["end"] = _parse_datetime(end_date, end_time)
             elif end_time:
-                use_date = end_date or start_date or datetime.now().strftime('%Y-%m-%d')
-                updates["end"] = datetime.fromisoformat(f"{use_date}T{end_time}")
+                use_date = end_date or start_date or _date_strings()[0]
+                updates["end"] = _parse_datetime(use_date, end_time)
 
             if not updates:
                 return {"error": "Nessuna modifica specificata"}
 
-            event = calendar_client.update_event(event_id=event_id, updates=updates)
+            event = await _run_calendar(calendar_client.update_event, event_id=event_id, updates=updates)
 
             return {
                 "operation": "update_event",
@@ -564,17 +1162,17 @@ class CalendarAgent(BaseAgent):
                 "message": f"Evento '{event['title']}' aggiornato"
             }
         except Exception as e:
-            self.logger.error(f"update_event failed: {e}")
+            self.logger.error("update_event failed: %s", e)
             return {"error": f"Errore nell'aggiornamento: {str(e)}"}
 
-    async def _tool_delete_event(self, params: dict) -> dict:
+    async def _tool_delete_event(self, params: dict, user_id: str = None) -> dict:
         """Delete a calendar event."""
         try:
             event_id = params.get("event_id")
             if not event_id:
                 return {"error": "event_id mancante"}
 
-            calendar_client.delete_event(event_id)
+            await _run_calendar(calendar_client.delete_event, event_id)
 
             return {
                 "operation": "delete_event",
@@ -582,20 +1180,55 @@ class CalendarAgent(BaseAgent):
                 "message": "Evento eliminato"
             }
         except Exception as e:
-            self.logger.error(f"delete_event failed: {e}")
+            self.logger.error("delete_event failed: %s", e)
             return {"error": f"Errore nell'eliminazione: {str(e)}"}
 
-    async def _tool_find_free_slots(self, params: dict) -> dict:
+    async def _batch_delete_events(self, params_list: list[dict]) -> list[dict]:
+        """Delete several events with one batch request; results keep the input order."""
+        results: list[dict | None] = [None] * len(params_list)
+        event_ids = []
+        for index, params in enumerate(params_list):
+            event_id = params.get("event_id")
+            if event_id:
+                event_ids.append((index, event_id))
+            else:
+                results[index] = {"error": "event_id mancante"}
+
+        if event_ids:
+            try:
+                outcomes = await _run_calendar(
+                    calendar_client.batch_delete_events, [event_id for _, event_id in event_ids]
+                )
+            except Exception as e:
+                outcomes = [e] * len(event_ids)
+
+            for (index, event_id), outcome in zip(event_ids, outcomes):
+                if isinstance(outcome, Exception):
+                    self.logger.error("delete_event failed: %s", outcome)
+                    results[index] = {"error": f"Errore nell'eliminazione: {str(outcome)}"}
+                else:
+                    results[index] = {
+                        "operation": "delete_event",
+                        "event_id": event_id,
+                        "message": "Evento eliminato"
+                    }
+
+        user_id = getattr(self, "_current_user_id", None)
+        if user_id and any("error" not in r for r in results):
+            await self._invalidate_events_cache(user_id)
+        return results
+
+    async def _tool_find_free_slots(self, params: dict, user_id: str = None) -> dict:
         """Find free time slots."""
         try:
-            duration = params.get("duration_minutes", 60)
+            duration = int(params.get("duration_minutes", 60))
             start_date = params.get("start_date")
             end_date = params.get("end_date")
 
-            start = datetime.fromisoformat(f"{start_date}T00:00")
-            end = datetime.fromisoformat(f"{end_date}T23:59")
+            start = _parse_date(start_date)
+            end = _parse_date(end_date, 23, 59)
 
-            slots = calendar_client.find_free_slots(
+            slots = await calendar_client.find_free_slots_async(
                 duration_minutes=duration,
                 start=start,
                 end=end
@@ -608,7 +1241,7 @@ class CalendarAgent(BaseAgent):
                 "count": len(slots)
             }
         except Exception as e:
-            self.logger.error(f"find_free_slots failed: {e}")
+            self.logger.error("find_free_slots failed: %s", e)
             return {"error": f"Errore nella ricerca slot: {str(e)}"}
 
 
@@ -1,11 +1,18 @@
 """Email agent - LLM-powered with tool calling."""
 
+import hashlib
 import re
+from email.utils import getaddresses
 from typing import Any
-import json
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
 from jarvis.agents.base import BaseAgent
+from jarvis.utils.llm_json import parse_llm_json, tools_json
+from jarvis.config import get_settings
 from jarvis.core.state import JarvisState
+from jarvis.db.redis_client import redis_client
 from jarvis.integrations.gmail import gmail_client
 from jarvis.integrations.gemini import gemini
 from jarvis.integrations.openai_embeddings import openai_embeddings
@@ -90,6 +97,97 @@ ESEMPI:
 
 Rispondi SOLO con il JSON, nient'altro."""
 
+_TOOLS_JSON = tools_json(EMAIL_TOOLS)
+_AGENT_PROMPT = AGENT_SYSTEM_PROMPT.format(tools=_TOOLS_JSON)
+
+_EMAIL_ADDR_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", re.ASCII)
+
+
+def _is_valid_email(addr: str) -> bool:
+    """Cheap length/@ checks first, so obvious non-addresses never reach the regex."""
+    return 3 <= len(addr) < 254 and addr.count("@") == 1 and _EMAIL_ADDR_RE.fullmatch(addr) is not None
+
+
+def _recipient_error(to: str | None) -> str | None:
+    """Reject a missing or malformed recipient here instead of after a failed Gmail round-trip."""
+    if not to:
+        return "Destinatario mancante"
+    invalid = [addr or name for name, addr in getaddresses([to]) if not _is_valid_email(addr)]
+    if invalid and not all(invalid):
+        # The parser could not split the field (e.g. "a@b@c.it"): report it whole
+        invalid = [to]
+    if invalid:
+        return f"Destinatario non valido: {', '.join(invalid)}"
+    return None
+
+
+def _json_value_end(text: str, start: int) -> int | None:
+    """Index just past the JSON object/array opening at text[start], None if not closed yet."""
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch in "{[":
+            depth += 1
+        elif ch in "}]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return None
+
+
+# Cached decisions are tied to the prompt and tool schema they were produced with
+_DECISION_CACHE_VERSION = hashlib.sha1(_AGENT_PROMPT.encode()).hexdigest()[:8]
+# Only decisions made entirely of these are cached: replaying a send would repeat it
+_READ_TOOLS = frozenset({"get_inbox", "get_email", "search_emails"})
+
+# "Name <email@example.com>" sender header
+_SENDER_RE = re.compile(r'^"?([^"<]+)"?\s*<([^>]+)>$')
+_GENERIC_SENDER_NAMES = frozenset({"info", "support", "admin", "noreply", "no-reply", "notifications", "newsletter"})
+
+
+# Plain inbox checks ("controlla le email", "ho email nuove?"), answered without the LLM;
+# anything with a sender, subject or action falls through to the model
+_FAST_INBOX_RE = re.compile(
+    r"(?:(?:controlla|leggi|mostrami|fammi vedere|dammi)(?: l[ae])?(?: mie)?(?: ultime)?"
+    r"|(?:ho|ci sono)(?: delle| dell')?)"
+    r"(?P<new> nuove)? ?\b(?:e-?mail|mail|posta)(?: (?P<unread>nuove|non lette))?[?!. ]*"
+)
+
+
+def _fast_route(user_input: str) -> dict | None:
+    """Return a get_inbox decision for trivial inbox checks, None to defer to the LLM."""
+    text = " ".join(user_input.lower().split())
+    match = _FAST_INBOX_RE.fullmatch(text)
+    if not match:
+        return None
+    # "nuove"/"non lette" are captured by the pattern itself: no extra substring scans
+    unread_only = bool(match["new"] or match["unread"])
+    return {"tool": "get_inbox", "params": {"max_results": 10, "unread_only": unread_only}}
+
+
+# Caps the Gmail calls a multi-tool decision runs at once (shared by all requests)
+_GMAIL_SEMAPHORE = asyncio.Semaphore(get_settings().email_max_concurrency)
+
+# Dedicated pool for the blocking Gmail client, so its HTTP round-trips do not stall the event loop
+_GMAIL_EXECUTOR = ThreadPoolExecutor(max_workers=get_settings().email_max_concurrency, thread_name_prefix="gmail")
+
+
+async def _run_gmail(fn, /, *args, **kwargs):
+    """Run a blocking gmail_client call on the Gmail thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_GMAIL_EXECUTOR, partial(fn, *args, **kwargs))
+
 
 class EmailAgent(BaseAgent):
     name = "email"
@@ -98,6 +196,8 @@ class EmailAgent(BaseAgent):
     async def _enrich_entities_from_emails(self, user_id: str, emails: list[dict]) -> None:
         """Extract person entities from email senders/recipients (background task)."""
         try:
+            # Pass 1: one candidate per sender name
+            senders: dict[str, tuple[str, str | None]] = {}
             for email in emails:
                 from_field = email.get("from", "")
 
@@ -105,7 +205,7 @@ class EmailAgent(BaseAgent):
                     continue
 
                 # Parse email header: "Name <email@example.com>" or just "email@example.com"
-                name_match = re.match(r'^"?([^"<]+)"?\s*<([^>]+)>$', from_field.strip())
+                name_match = _SENDER_RE.match(from_field.strip())
                 if name_match:
                     name = name_match.group(1).strip()
                     email_addr = name_match.group(2).strip()
@@ -117,104 +217,201 @@ class EmailAgent(BaseAgent):
                     name = " ".join(p.capitalize() for p in name_parts)
 
                 # Skip if name is too short or generic
-                if len(name) < 3 or name.lower() in ["info", "support", "admin", "noreply", "no-reply", "notifications", "newsletter"]:
+                if len(name) < 3 or name.lower() in _GENERIC_SENDER_NAMES:
                     continue
 
-                # Generate embedding for the entity (OpenAI 3072-dim)
-                embedding = await openai_embeddings.embed(name)
-
-                # Try to create entity (will fail silently if exists)
-                entity = await KGEntityRepository.create_entity(
-                    user_id=user_id,
-                    canonical_name=name,
-                    entity_type="person",
-                    properties={"email": email_addr, "source": "email"},
-                    embedding=embedding,
-                    confidence=0.7,  # Slightly higher confidence from email (has real name)
-                    source_type="email",
-                    source_id=email.get("id")
-                )
+                senders.setdefault(name, (email_addr, email.get("id")))
 
-                if entity:
-                    # Add email as alias
-                    await KGAliasRepository.add_alias(entity["id"], email_addr, confidence=0.95)
-                    # Add local part as alias
-                    local_part = email_addr.split("@")[0]
-                    await KGAliasRepository.add_alias(entity["id"], local_part, confidence=0.7)
-                    self.logger.debug(f"Created entity from email: {name}")
-                else:
-                    # Entity already exists, try to update mention
-                    existing = await KGEntityRepository.get_entity_by_name(user_id, name, "person")
-                    if existing:
-                        await KGEntityRepository.update_mention(existing["id"])
-                        # Ensure email is added as alias
-                        await KGAliasRepository.add_alias(existing["id"], email_addr, confidence=0.95)
+            if not senders:
+                return
+
+            # Pass 2: one embeddings request for every sender (OpenAI 3072-dim)
+            names = list(senders)
+            embeddings = await openai_embeddings.embed_batch(names)
+
+            # Pass 3: independent per-sender writes run concurrently
+            results = await asyncio.gather(
+                *(
+                    self._save_sender_entity(user_id, name, *senders[name], embedding)
+                    for name, embedding in zip(names, embeddings)
+                ),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.warning("Failed to save sender entity: %s", result)
 
         except Exception as e:
             self.logger.warning(f"Failed to enrich entities from emails: {e}")
 
+    async def _save_sender_entity(
+        self,
+        user_id: str,
+        name: str,
+        email_addr: str,
+        source_id: str | None,
+        embedding: list[float]
+    ) -> None:
+        """Create the person entity for a sender, or record a new mention of the existing one."""
+        # Try to create entity (will fail silently if exists)
+        entity = await KGEntityRepository.create_entity(
+            user_id=user_id,
+            canonical_name=name,
+            entity_type="person",
+            properties={"email": email_addr, "source": "email"},
+            embedding=embedding,
+            confidence=0.7,  # Slightly higher confidence from email (has real name)
+            source_type="email",
+            source_id=source_id
+        )
+
+        if entity:
+            # Email and local part as aliases
+            await asyncio.gather(
+                KGAliasRepository.add_alias(entity["id"], email_addr, confidence=0.95),
+                KGAliasRepository.add_alias(entity["id"], email_addr.split("@")[0], confidence=0.7),
+            )
+            self.logger.debug("Created entity from email: %s", name)
+        else:
+            # Entity already exists, try to update mention
+            existing = await KGEntityRepository.get_entity_by_name(user_id, name, "person")
+            if existing:
+                # Ensure email is added as alias
+                await asyncio.gather(
+                    KGEntityRepository.update_mention(existing["id"]),
+                    KGAliasRepository.add_alias(existing["id"], email_addr, confidence=0.95),
+                )
+
     async def _execute(self, state: JarvisState) -> Any:
         """Execute email operations using LLM reasoning."""
         user_input = state.get("enriched_input", state["current_input"])
         user_id = state["user_id"]
         self._current_user_id = user_id  # Store for tool methods
 
-        # Format tools for prompt
-        tools_str = json.dumps(EMAIL_TOOLS, indent=2, ensure_ascii=False)
+        decision = _fast_route(user_input)
+        if decision is not None:
+            self.logger.info("Email agent: fast route")
+            return await self._execute_tool(decision["tool"], decision["params"])
 
         # Build prompt
-        prompt = AGENT_SYSTEM_PROMPT.format(tools=tools_str)
+        prompt = _AGENT_PROMPT
 
-        # Ask LLM what to do
-        response = await gemini.generate(
-            user_input,
-            system_instruction=prompt,
-            model="gemini-2.5-flash",
-            temperature=0.1
-        )
+        cache_key = self._decision_cache_key(user_id, user_input)
+        cached = await self._get_cached_decision(cache_key)
+        if cached is not None:
+            self.logger.info("Email agent: reusing cached decision")
+            response = ""
+        else:
+            # Ask LLM what to do
+            response = await self._generate_decision(user_input, prompt)
 
         # Parse LLM response
         try:
-            clean_response = response.strip()
-            if clean_response.startswith("```"):
-                clean_response = clean_response.split("```")[1]
-                if clean_response.startswith("json"):
-                    clean_response = clean_response[4:]
-                clean_response = clean_response.strip()
+            if cached is not None:
+                decision = cached
+            else:
+                decision = parse_llm_json(response)
+                calls = decision if isinstance(decision, list) else [decision]
+                if calls and all(call.get("tool") in _READ_TOOLS for call in calls):
+                    await self._set_cached_decision(cache_key, decision)
 
-            decision = json.loads(clean_response)
+            # A one-element list is just a single call: skip the gather/multiple_results path
+            if isinstance(decision, list) and len(decision) == 1:
+                decision = decision[0]
 
             # Handle both single and multiple tool calls
             if isinstance(decision, list):
                 # Multiple tool calls - execute in parallel
-                self.logger.info(f"Email agent: {len(decision)} tool calls to execute")
-                tasks = []
+                self.logger.info("Email agent: %d tool calls to execute", len(decision))
                 for call in decision:
-                    tool_name = call.get("tool")
-                    params = call.get("params", {})
-                    self.logger.info(f"Email agent decision: {tool_name} with {params}")
-                    tasks.append(self._execute_tool(tool_name, params))
-
-                results = await asyncio.gather(*tasks, return_exceptions=True)
+                    self.logger.info("Email agent decision: %s with %s", call.get("tool"), call.get("params", {}))
+
+                # Several send_email go out as one batch HTTP request
+                send_indexes = [i for i, call in enumerate(decision) if call.get("tool") == "send_email"]
+                if len(send_indexes) < 2:
+                    send_indexes = []
+                batched = set(send_indexes)
+                other_indexes = [i for i in range(len(decision)) if i not in batched]
+
+                send_results, *other_results = await asyncio.gather(
+                    self._batch_send_emails([decision[i].get("params", {}) for i in send_indexes]),
+                    *(
+                        self._bounded_execute_tool(decision[i].get("tool"), decision[i].get("params", {}))
+                        for i in other_indexes
+                    ),
+                    return_exceptions=True
+                )
+                results = [None] * len(decision)
+                if isinstance(send_results, BaseException):
+                    send_results = [send_results] * len(send_indexes)
+                for i, r in zip(send_indexes, send_results):
+                    results[i] = r
+                for i, r in zip(other_indexes, other_results):
+                    results[i] = r
                 # Convert exceptions to error dicts
-                processed_results = []
-                for r in results:
-                    if isinstance(r, Exception):
-                        processed_results.append({"error": str(r)})
-                    else:
-                        processed_results.append(r)
+                processed_results = [{"error": str(r)} if isinstance(r, BaseException) else r for r in results]
                 return {"multiple_results": processed_results}
             else:
                 # Single tool call
                 tool_name = decision.get("tool")
                 params = decision.get("params", {})
-                self.logger.info(f"Email agent decision: {tool_name} with {params}")
+                self.logger.info("Email agent decision: %s with %s", tool_name, params)
                 return await self._execute_tool(tool_name, params)
 
         except Exception as e:
-            self.logger.error(f"Failed to parse LLM response: {response[:200]}")
+            self.logger.error("Failed to parse LLM response: %s", response[:200])
             return {"error": f"Non ho capito la richiesta: {str(e)}"}
 
+    async def _generate_decision(self, user_input: str, system_instruction: str) -> str:
+        """Stream the decision and stop reading as soon as the JSON value is complete.
+
+        Returns the JSON slice, or the whole text when no complete value was seen.
+        """
+        stream = gemini.generate_stream(
+            user_input,
+            system_instruction=system_instruction,
+            model="gemini-2.5-flash",
+            temperature=0.1
+        )
+        text = ""
+        start = -1
+        try:
+            async for chunk in stream:
+                text += chunk
+                if start < 0:
+                    start = min((i for i in (text.find("{"), text.find("[")) if i >= 0), default=-1)
+                    if start < 0:
+                        continue
+                end = _json_value_end(text, start)
+                if end is not None:
+                    return text[start:end]
+        finally:
+            await stream.aclose()
+        return text
+
+    def _decision_cache_key(self, user_id: str, user_input: str) -> str:
+        normalized = " ".join(user_input.lower().split())
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return f"jarvis:cache:email_decision:{user_id}:{_DECISION_CACHE_VERSION}:{digest}"
+
+    async def _get_cached_decision(self, key: str) -> dict | list | None:
+        try:
+            return await redis_client.get(key)
+        except Exception as e:
+            self.logger.warning("Decision cache read failed: %s", e)
+            return None
+
+    async def _set_cached_decision(self, key: str, decision: dict | list) -> None:
+        try:
+            await redis_client.set(key, decision, get_settings().cache_ttl_llm_decision)
+        except Exception as e:
+            self.logger.warning("Decision cache write failed: %s", e)
+
+    async def _bounded_execute_tool(self, tool_name: str, params: dict) -> dict:
+        """Run one call of a multi-tool decision without exceeding the Gmail concurrency cap."""
+        async with _GMAIL_SEMAPHORE:
+            return await self._execute_tool(tool_name, params)
+
     async def _execute_tool(self, tool_name: str, params: dict) -> dict:
         """Execute the selected tool with given parameters."""
         user_id = getattr(self, "_current_user_id", None)
@@ -237,21 +434,25 @@ class EmailAgent(BaseAgent):
     async def _tool_get_inbox(self, params: dict, user_id: str = None) -> dict:
         """Get inbox emails."""
         try:
-            emails = gmail_client.get_inbox(
+            emails = await _run_gmail(
+                gmail_client.get_inbox,
                 max_results=params.get("max_results", 10),
                 unread_only=params.get("unread_only", False),
                 query=params.get("query")
             )
 
-            # Summarize for response
+            # Summarize for response, counting unread in the same pass
             summaries = []
-            for email in emails[:10]:
+            unread_count = 0
+            for email in islice(emails, 10):
+                is_unread = email.get("is_unread", False)
+                unread_count += is_unread
                 summaries.append({
                     "id": email["id"],
                     "from": email["from"],
                     "subject": email["subject"],
-                    "snippet": email["snippet"][:100] if email.get("snippet") else "",
-                    "is_unread": email.get("is_unread", False)
+                    "snippet": (email.get("snippet") or "")[:100],
+                    "is_unread": is_unread
                 })
 
             # Enrich KG with senders (background task)
@@ -262,7 +463,7 @@ class EmailAgent(BaseAgent):
                 "operation": "get_inbox",
                 "emails": summaries,
                 "count": len(summaries),
-                "unread_count": sum(1 for e in summaries if e.get("is_unread"))
+                "unread_count": unread_count
             }
         except Exception as e:
             self.logger.error(f"get_inbox failed: {e}")
@@ -272,7 +473,7 @@ class EmailAgent(BaseAgent):
         """Get full email content."""
         try:
             message_id = params.get("message_id")
-            email = gmail_client.get_email(message_id)
+            email = await _run_gmail(gmail_client.get_email, message_id)
 
             return {
                 "operation": "get_email",
@@ -289,10 +490,11 @@ class EmailAgent(BaseAgent):
             subject = params.get("subject", "")
             body = params.get("body", "")
 
-            if not to:
-                return {"error": "Destinatario mancante"}
+            error = _recipient_error(to)
+            if error:
+                return {"error": error}
 
-            result = gmail_client.send_email(to=to, subject=subject, body=body)
+            result = await _run_gmail(gmail_client.send_email, to=to, subject=subject, body=body)
 
             return {
                 "operation": "send_email",
@@ -303,6 +505,36 @@ class EmailAgent(BaseAgent):
             self.logger.error(f"send_email failed: {e}")
             return {"error": f"Errore nell'invio email: {str(e)}"}
 
+    async def _batch_send_emails(self, params_list: list[dict]) -> list[dict]:
+        """Send several emails with one batch request; results keep the input order."""
+        results: list[dict | None] = [None] * len(params_list)
+        messages = []
+        for index, params in enumerate(params_list):
+            to = params.get("to")
+            error = _recipient_error(to)
+            if error:
+                results[index] = {"error": error}
+            else:
+                messages.append((index, {"to": to, "subject": params.get("subject", ""), "body": params.get("body", "")}))
+
+        if messages:
+            try:
+                outcomes = await _run_gmail(gmail_client.batch_send_emails, [kwargs for _, kwargs in messages])
+            except Exception as e:
+                outcomes = [e] * len(messages)
+
+            for (index, kwargs), outcome in zip(messages, outcomes):
+                if isinstance(outcome, Exception):
+                    self.logger.error("send_email failed: %s", outcome)
+                    results[index] = {"error": f"Errore nell'invio email: {str(outcome)}"}
+                else:
+                    results[index] = {
+                        "operation": "send_email",
+                        "result": outcome,
+                        "message": f"Email inviata a {kwargs['to']}"
+                    }
+        return results
+
     async def _tool_reply_email(self, params: dict) -> dict:
         """Reply to an email."""
         try:
@@ -312,7 +544,7 @@ class EmailAgent(BaseAgent):
             if not message_id:
                 return {"error": "ID email mancante"}
 
-            result = gmail_client.reply_email(message_id=message_id, body=body)
+            result = await _run_gmail(gmail_client.reply_email, message_id=message_id, body=body)
 
             return {
                 "operation": "reply_email",
@@ -330,7 +562,7 @@ class EmailAgent(BaseAgent):
             subject = params.get("subject", "")
             body = params.get("body", "")
 
-            result = gmail_client.create_draft(to=to, subject=subject, body=body)
+            result = await _run_gmail(gmail_client.create_draft, to=to, subject=subject, body=body)
 
             return {
                 "operation": "create_draft",
@@ -347,16 +579,17 @@ class EmailAgent(BaseAgent):
             query = params.get("query", "")
             max_results = params.get("max_results", 10)
 
-            emails = gmail_client.search_emails(query=query, max_results=max_results)
+            emails = await _run_gmail(gmail_client.search_emails, query=query, max_results=max_results)
 
-            summaries = []
-            for email in emails:
-                summaries.append({
+            summaries = [
+                {
                     "id": email["id"],
                     "from": email["from"],
                     "subject": email["subject"],
-                    "snippet": email["snippet"][:100] if email.get("snippet") else ""
-                })
+                    "snippet": (email.get("snippet") or "")[:100]
+                }
+                for email in emails
+            ]
 
             # Enrich KG with senders (background task)
             if summaries and user_id:
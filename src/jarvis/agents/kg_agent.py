@@ -1,8 +1,8 @@
 """Knowledge Graph Agent - Structured queries about people, organizations, and relationships."""
 
-import json
 from typing import Any
 from jarvis.agents.base import BaseAgent
+from jarvis.utils.llm_json import parse_llm_json, tools_json
 from jarvis.core.state import JarvisState
 from jarvis.core.knowledge_graph import knowledge_graph
 from jarvis.db.kg_repository import (
@@ -76,6 +76,9 @@ ESEMPI:
 
 Rispondi SOLO con il JSON, nient'altro."""
 
+_TOOLS_JSON = tools_json(KG_TOOLS)
+_AGENT_PROMPT = AGENT_SYSTEM_PROMPT.format(tools=_TOOLS_JSON)
+
 
 class KnowledgeGraphAgent(BaseAgent):
     """Agent for querying the knowledge graph."""
@@ -88,11 +91,8 @@ class KnowledgeGraphAgent(BaseAgent):
         user_id = state["user_id"]
         user_input = state.get("enriched_input", state["current_input"])
 
-        # Format tools for prompt
-        tools_str = json.dumps(KG_TOOLS, indent=2, ensure_ascii=False)
-
         # Build prompt
-        prompt = AGENT_SYSTEM_PROMPT.format(tools=tools_str)
+        prompt = _AGENT_PROMPT
 
         # Ask LLM what to do
         response = await gemini.generate(
@@ -104,23 +104,16 @@ class KnowledgeGraphAgent(BaseAgent):
 
         # Parse LLM response
         try:
-            clean_response = response.strip()
-            if clean_response.startswith("```"):
-                clean_response = clean_response.split("```")[1]
-                if clean_response.startswith("json"):
-                    clean_response = clean_response[4:]
-                clean_response = clean_response.strip()
-
-            decision = json.loads(clean_response)
+            decision = parse_llm_json(response)
             tool_name = decision.get("tool")
             params = decision.get("params", {})
 
-            self.logger.info(f"KG agent decision: {tool_name} with {params}")
+            self.logger.info("KG agent decision: %s with %s", tool_name, params)
 
             return await self._execute_tool(user_id, tool_name, params)
 
         except Exception as e:
-            self.logger.error(f"Failed to parse LLM response: {response[:200]}")
+            self.logger.error("Failed to parse LLM response: %s", response[:200])
             return {"error": f"Non ho capito la richiesta: {str(e)}"}
 
     async def _execute_tool(self, user_id: str, tool_name: str, params: dict) -> dict:
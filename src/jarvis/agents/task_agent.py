@@ -3,9 +3,9 @@
 import asyncio
 from datetime import datetime, timedelta
 from typing import Any
-import json
 
 from jarvis.agents.base import BaseAgent
+from jarvis.utils.llm_json import parse_llm_json, tools_json
 from jarvis.core.state import JarvisState
 from jarvis.config import get_settings
 from jarvis.integrations.notion import notion_client, NotionClient
@@ -124,6 +124,10 @@ ESEMPI:
 
 Rispondi SOLO con JSON."""
 
+_TOOLS_JSON = tools_json(TASK_TOOLS)
+
+WEEKDAY_NAMES = ("Lunedi", "Martedi", "Mercoledi", "Giovedi", "Venerdi", "Sabato", "Domenica")
+
 
 class TaskAgent(BaseAgent):
     name = "task"
@@ -276,8 +280,7 @@ class TaskAgent(BaseAgent):
         now = datetime.now()
         today = now.strftime("%Y-%m-%d")
         in_7_days = (now + timedelta(days=7)).strftime("%Y-%m-%d")
-        weekday_names = ["Lunedi", "Martedi", "Mercoledi", "Giovedi", "Venerdi", "Sabato", "Domenica"]
-        weekday = weekday_names[now.weekday()]
+        weekday = WEEKDAY_NAMES[now.weekday()]
 
         # Load databases and schemas
         databases, databases_info = await self._get_databases_info()
@@ -287,13 +290,11 @@ class TaskAgent(BaseAgent):
         settings = get_settings()
         user_name = settings.notion_user_name or "utente"
 
-        tools_str = json.dumps(TASK_TOOLS, indent=2, ensure_ascii=False)
-
         prompt = AGENT_SYSTEM_PROMPT.format(
             today=today,
             weekday=weekday,
             databases_info=databases_info,
-            tools=tools_str,
+            tools=_TOOLS_JSON,
             in_7_days=in_7_days,
             user_name=user_name,
         )
@@ -314,7 +315,7 @@ class TaskAgent(BaseAgent):
         try:
             decision = self._parse_json_response(response)
         except Exception as e:
-            self.logger.error(f"Failed to parse LLM response: {response[:200]}")
+            self.logger.error("Failed to parse LLM response: %s", response[:200])
             return {"error": f"Non ho capito la richiesta: {e}"}
 
         tool_name = decision.get("tool")
@@ -336,13 +337,7 @@ class TaskAgent(BaseAgent):
 
     def _parse_json_response(self, response: str) -> dict:
         """Parse JSON from LLM response, handling markdown code blocks."""
-        clean = response.strip()
-        if clean.startswith("```"):
-            clean = clean.split("```")[1]
-            if clean.startswith("json"):
-                clean = clean[4:]
-            clean = clean.strip()
-        return json.loads(clean)
+        return parse_llm_json(response)
 
     async def _execute_tool(self, tool_name: str, params: dict) -> dict:
         """Execute the selected tool."""
@@ -1,9 +1,9 @@
 """Web agent - LLM-powered with tool calling."""
 
 from typing import Any
-import json
 import asyncio
 from jarvis.agents.base import BaseAgent
+from jarvis.utils.llm_json import parse_llm_json, tools_json
 from jarvis.core.state import JarvisState
 from jarvis.integrations.perplexity import perplexity
 from jarvis.integrations.apify_google import apify_google
@@ -62,6 +62,9 @@ ESEMPI:
 
 Rispondi SOLO con il JSON, nient'altro."""
 
+_TOOLS_JSON = tools_json(WEB_TOOLS)
+_AGENT_PROMPT = AGENT_SYSTEM_PROMPT.format(tools=_TOOLS_JSON)
+
 
 class WebAgent(BaseAgent):
     name = "web"
@@ -71,11 +74,8 @@ class WebAgent(BaseAgent):
         """Execute web operations using LLM reasoning."""
         user_input = state.get("enriched_input", state["current_input"])
 
-        # Format tools for prompt
-        tools_str = json.dumps(WEB_TOOLS, indent=2, ensure_ascii=False)
-
         # Build prompt
-        prompt = AGENT_SYSTEM_PROMPT.format(tools=tools_str)
+        prompt = _AGENT_PROMPT
 
         # Ask LLM what to do
         response = await gemini.generate(
@@ -87,44 +87,36 @@ class WebAgent(BaseAgent):
 
         # Parse LLM response
         try:
-            clean_response = response.strip()
-            if clean_response.startswith("```"):
-                clean_response = clean_response.split("```")[1]
-                if clean_response.startswith("json"):
-                    clean_response = clean_response[4:]
-                clean_response = clean_response.strip()
+            decision = parse_llm_json(response)
 
-            decision = json.loads(clean_response)
+            # A one-element list is just a single call: skip the gather/multiple_results path
+            if isinstance(decision, list) and len(decision) == 1:
+                decision = decision[0]
 
             # Handle both single and multiple tool calls
             if isinstance(decision, list):
                 # Multiple tool calls - execute in parallel
-                self.logger.info(f"Web agent: {len(decision)} tool calls to execute")
+                self.logger.info("Web agent: %d tool calls to execute", len(decision))
                 tasks = []
                 for call in decision:
                     tool_name = call.get("tool")
                     params = call.get("params", {})
-                    self.logger.info(f"Web agent decision: {tool_name} with {params}")
+                    self.logger.info("Web agent decision: %s with %s", tool_name, params)
                     tasks.append(self._execute_tool(tool_name, params))
 
                 results = await asyncio.gather(*tasks, return_exceptions=True)
                 # Convert exceptions to error dicts
-                processed_results = []
-                for r in results:
-                    if isinstance(r, Exception):
-                        processed_results.append({"error": str(r)})
-                    else:
-                        processed_results.append(r)
+                processed_results = [{"error": str(r)} if isinstance(r, BaseException) else r for r in results]
                 return {"multiple_results": processed_results}
             else:
                 # Single tool call
                 tool_name = decision.get("tool")
                 params = decision.get("params", {})
-                self.logger.info(f"Web agent decision: {tool_name} with {params}")
+                self.logger.info("Web agent decision: %s with %s", tool_name, params)
                 return await self._execute_tool(tool_name, params)
 
         except Exception as e:
-            self.logger.error(f"Failed to parse LLM response: {response[:200]}")
+            self.logger.error("Failed to parse LLM response: %s", response[:200])
             return {"error": f"Non ho capito la richiesta: {str(e)}"}
 
     async def _execute_tool(self, tool_name: str, params: dict) -> dict:
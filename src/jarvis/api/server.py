@@ -254,8 +254,17 @@ if os.path.exists(frontend_dir):
 @app.on_event("startup")
 async def startup_event():
     logger.info("Jarvis API server starting...")
+    from jarvis.db.redis_client import redis_client
+    from jarvis.db.pool import pg_pool
+    # Freshness cache lives in Redis so every uvicorn worker shares it
+    await redis_client.connect()
+    await pg_pool.connect()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Jarvis API server shutting down...")
+    from jarvis.db.redis_client import redis_client
+    from jarvis.db.pool import pg_pool
+    await pg_pool.disconnect()
+    await redis_client.disconnect()
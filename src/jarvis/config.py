@@ -25,10 +25,12 @@ class Settings(BaseSettings):
     supabase_url: str = Field(..., alias="SUPABASE_URL")
     supabase_key: str = Field(..., alias="SUPABASE_KEY")
     supabase_service_key: str = Field(..., alias="SUPABASE_SERVICE_KEY")
-    supabase_postgres_url: str = Field(default="", alias="SUPABASE_POSTGRES_URL")  # For checkpointing
+    supabase_postgres_url: str = Field(default="", alias="SUPABASE_POSTGRES_URL")  # Transaction pooler (port 6543), used by db/pool.py
+    supabase_postgres_direct_url: str = Field(default="", alias="SUPABASE_POSTGRES_DIRECT_URL")  # Session connection for LISTEN (worker)
 
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", alias="REDIS_URL")
+    redis_max_connections: int = 50  # Pool condiviso da tutte le coroutine del processo
 
     # Telegram
     telegram_bot_token: str = Field(..., alias="TELEGRAM_BOT_TOKEN")
@@ -42,6 +44,13 @@ class Settings(BaseSettings):
     cache_ttl_calendar: int = 300  # 5 minuti
     cache_ttl_email: int = 60      # 1 minuto
     cache_ttl_web: int = 3600      # 1 ora
+    cache_ttl_llm_decision: int = 900  # 15 minuti
+
+    # Calendar: fetch today+tomorrow while the LLM decides (one extra API call when it picks another tool)
+    calendar_speculative_prefetch: bool = True
+
+    # Email: Gmail calls in flight at once when the LLM returns several tool calls
+    email_max_concurrency: int = 8
 
     # LLM
     default_model: str = "gemini-2.5-flash"  # Upgraded from 2.0
@@ -86,6 +95,8 @@ class Settings(BaseSettings):
     worker_poll_interval_active: float = 0.5   # Polling ogni 500ms quando attivo
     worker_poll_interval_idle: float = 2.0     # Backoff a 2s quando idle
     worker_stale_timeout_minutes: int = 30     # Timeout per task bloccati
+    worker_claim_batch_size: int = 8           # Task claimati per round-trip
+    worker_listen_fallback_interval: float = 30.0  # Poll di sicurezza quando LISTEN è attivo
 
     # Briefing
     briefing_morning_hour: int = 7
@@ -33,6 +33,14 @@ class FreshnessChecker:
         key = self._get_key(resource, user_id, query_hash)
         return await redis_client.get(key)
 
+    async def get_cached_many(self, resources: list[str], user_id: str) -> dict[str, dict | None]:
+        """Get cached data for several resources with a single MGET."""
+        if not resources:
+            return {}
+        keys = [self._get_key(resource, user_id) for resource in resources]
+        values = await redis_client.mget(keys)
+        return dict(zip(resources, values))
+
     async def set_cache(
         self,
         resource: str,
@@ -1,4 +1,6 @@
 import asyncio
+from datetime import date
+from functools import lru_cache
 from typing import Literal
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import HumanMessage, AIMessage
@@ -12,6 +14,7 @@ from jarvis.agents import AGENTS
 from jarvis.integrations.gemini import gemini
 from jarvis.db.repositories import ChatRepository
 from jarvis.utils.logging import get_logger
+from jarvis.utils.llm_json import parse_llm_json
 
 logger = get_logger(__name__)
 
@@ -124,15 +127,28 @@ IMPORTANTE: Se "DATI DAGLI AGENTI" è vuoto, NON HAI DATI REALI. Non fingere di
 """
 
 
+@lru_cache(maxsize=4)
+def _today_label(day: date) -> str:
+    """Human-readable date for the response prompt, formatted once per day."""
+    return day.strftime("%A %d %B %Y")
+
+
 async def analyze_intent(state: JarvisState) -> JarvisState:
-    """Analyze user intent and determine required agents using LLM planner."""
+    """Plan the required agents and load memory context concurrently.
+
+    Memory retrieval does not depend on the plan and both branches of the graph use it,
+    so it runs alongside the planner LLM call instead of after it.
+    """
     user_input = state["current_input"]
     user_id = state["user_id"]
     messages = state.get("messages", [])
 
     history = messages[:-1] if len(messages) > 1 else []
 
-    required_agents, plan_steps = await planner.plan(user_input, user_id, history=history)
+    (required_agents, plan_steps), (facts, entities) = await asyncio.gather(
+        planner.plan(user_input, user_id, history=history),
+        _load_memory_context(user_id, user_input),
+    )
 
     if required_agents:
         intent = "action"
@@ -152,15 +168,13 @@ async def analyze_intent(state: JarvisState) -> JarvisState:
         "step_retry_count": 0,
         "max_retries": 2,
         "max_steps": 3,
+        "memory_context": facts,
+        "entity_context": entities,
     }
 
 
-async def load_memory(state: JarvisState) -> JarvisState:
-    """Load relevant memory facts and entities in parallel."""
-    user_id = state["user_id"]
-    user_input = state["current_input"]
-
-    # Retrieve facts and entities in parallel
+async def _load_memory_context(user_id: str, user_input: str) -> tuple[list, list]:
+    """Load relevant memory facts and entities in parallel (empty lists on failure)."""
     facts = []
     entities = []
 
@@ -187,11 +201,7 @@ async def load_memory(state: JarvisState) -> JarvisState:
 
     logger.debug(f"Loaded {len(facts)} memory facts, {len(entities)} entities")
 
-    return {
-        **state,
-        "memory_context": facts,
-        "entity_context": entities
-    }
+    return facts, entities
 
 
 async def enrich_query(state: JarvisState) -> JarvisState:
@@ -239,25 +249,27 @@ async def enrich_query(state: JarvisState) -> JarvisState:
 
 
 async def check_freshness(state: JarvisState) -> JarvisState:
-    """Check which resources need fresh data."""
+    """Check which resources need fresh data, prefetching cached payloads."""
     user_id = state["user_id"]
     required_agents = state["required_agents"]
 
-    # Map agents to resource types
+    # Map agents to resource types (agents with caching disabled have none)
     resource_types = list(set([
         AGENTS[agent].resource_type
         for agent in required_agents
-        if agent in AGENTS
+        if agent in AGENTS and AGENTS[agent].resource_type is not None
     ]))
 
-    # Check freshness for each resource
-    needs_refresh = await freshness.check_all(user_id, resource_types)
+    # One MGET for all resources: a hit is both "fresh" and the data agents will reuse
+    prefetched = await freshness.get_cached_many(resource_types, user_id)
+    needs_refresh = {resource: data is None for resource, data in prefetched.items()}
 
     logger.debug(f"Freshness check: {needs_refresh}")
 
     return {
         **state,
-        "needs_refresh": needs_refresh
+        "needs_refresh": needs_refresh,
+        "prefetched_cache": prefetched
     }
 
 
@@ -268,17 +280,16 @@ async def execute_agents(state: JarvisState) -> JarvisState:
     if not required_agents:
         return {**state, "agent_results": {}}
 
-    # Execute all agents in parallel
-    tasks = []
-    for agent_name in required_agents:
-        if agent_name in AGENTS:
-            tasks.append(AGENTS[agent_name].execute(state))
-
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Execute all agents in parallel (names kept aligned with results, unknown agents skipped)
+    agent_names = [name for name in required_agents if name in AGENTS]
+    results = await asyncio.gather(
+        *(AGENTS[name].execute(state) for name in agent_names),
+        return_exceptions=True
+    )
 
     # Process results
     agent_results = {}
-    for agent_name, result in zip(required_agents, results):
+    for agent_name, result in zip(agent_names, results):
         if isinstance(result, Exception):
             logger.error(f"Agent {agent_name} failed: {result}")
             agent_results[agent_name] = {
@@ -409,15 +420,7 @@ Suggerisci un approccio alternativo. Rispondi con JSON:
             temperature=0.2
         )
 
-        import json
-        clean = response.strip()
-        if clean.startswith("```"):
-            clean = clean.split("```")[1]
-            if clean.startswith("json"):
-                clean = clean[4:]
-            clean = clean.strip()
-
-        new_plan = json.loads(clean)
+        new_plan = parse_llm_json(response)
         new_agents = [a for a in new_plan.get("agents", []) if a in AGENTS]
 
         if new_agents:
@@ -527,10 +530,8 @@ async def generate_response(state: JarvisState) -> JarvisState:
     entity_str = knowledge_graph.format_entity_context(entity_context) if entity_context else "Nessuna entita conosciuta"
 
     # Build system prompt
-    from datetime import datetime
-    today = datetime.now().strftime("%A %d %B %Y")
     system_prompt = JARVIS_SYSTEM_PROMPT.format(
-        today=today,
+        today=_today_label(date.today()),
         memory_facts=memory_str,
         entity_context=entity_str,
         agent_data=agent_data_str
@@ -614,7 +615,6 @@ def build_graph() -> StateGraph:
     graph = StateGraph(JarvisState)
 
     graph.add_node("analyze_intent", analyze_intent)
-    graph.add_node("load_memory", load_memory)
     graph.add_node("prepare_step", prepare_step)
     graph.add_node("enrich_query", enrich_query)
     graph.add_node("check_freshness", check_freshness)
@@ -627,9 +627,8 @@ def build_graph() -> StateGraph:
 
     graph.set_entry_point("analyze_intent")
 
-    graph.add_edge("analyze_intent", "load_memory")
     graph.add_conditional_edges(
-        "load_memory",
+        "analyze_intent",
         should_use_agents,
         {
             "use_agents": "prepare_step",
@@ -684,6 +683,7 @@ async def process_message(user_id: str, message: str, history: list = None) -> s
         "required_agents": [],
         "agent_results": {},
         "needs_refresh": {},
+        "prefetched_cache": {},
         "memory_context": [],
         "entity_context": [],
         "final_response": None,
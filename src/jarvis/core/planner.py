@@ -1,11 +1,13 @@
 """LLM-based planner for complex intent routing."""
 
-import json
+import orjson
 from jarvis.integrations.gemini import gemini
 from jarvis.utils.logging import get_logger
+from jarvis.utils.llm_json import parse_llm_json
 
 logger = get_logger(__name__)
 
+
 # Available agents and their capabilities
 AGENT_CAPABILITIES = {
     "calendar": "Accesso al calendario Google: leggere eventi, CREARE nuovi eventi, modificare, cancellare, bloccare slot, fissare appuntamenti",
@@ -104,14 +106,7 @@ class Planner:
                 temperature=0.1
             )
 
-            clean_response = response.strip()
-            if clean_response.startswith("```"):
-                clean_response = clean_response.split("```")[1]
-                if clean_response.startswith("json"):
-                    clean_response = clean_response[4:]
-                clean_response = clean_response.strip()
-
-            result = json.loads(clean_response)
+            result = parse_llm_json(response)
             steps = result.get("steps", [])
             reasoning = result.get("reasoning", "")
 
@@ -132,7 +127,7 @@ class Planner:
             logger.info(f"Planner decision: {len(valid_steps)} steps, agents={unique_agents} - {reasoning}")
             return unique_agents, valid_steps
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.warning(f"Planner JSON parse error: {e}, response: {response[:200]}")
             agents = self._fallback_extraction(response)
             steps = [{"agents": agents, "goal": ""}] if agents else []
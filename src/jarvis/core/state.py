@@ -30,6 +30,7 @@ class JarvisState(TypedDict):
     # Execution
     agent_results: dict[str, AgentResult]
     needs_refresh: dict[str, bool]  # Which resources need fresh data
+    prefetched_cache: dict[str, Any]  # Cached payloads fetched in one MGET by check_freshness
 
     # Memory
     memory_context: list[str]  # Retrieved facts
@@ -1,5 +1,6 @@
 from jarvis.db.redis_client import redis_client, RedisClient
 from jarvis.db.supabase_client import supabase_client, get_db
+from jarvis.db.pool import pg_pool, PostgresPool
 from jarvis.db.repositories import (
     ChatRepository,
     MemoryRepository,
@@ -12,6 +13,8 @@ __all__ = [
     "RedisClient",
     "supabase_client",
     "get_db",
+    "pg_pool",
+    "PostgresPool",
     "ChatRepository",
     "MemoryRepository",
     "RAGRepository",
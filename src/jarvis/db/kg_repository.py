@@ -86,6 +86,27 @@ class KGEntityRepository:
         result = query.limit(1).execute()
         return result.data[0] if result.data else None
 
+    @staticmethod
+    async def get_entities_by_names(
+        user_id: str,
+        canonical_names: list[str],
+        entity_type: EntityType = None
+    ) -> dict[str, dict]:
+        """Get entities matching any of the canonical names (exact match), keyed by name."""
+        if not canonical_names:
+            return {}
+        db = get_db()
+        query = db.table("kg_entities") \
+            .select("*") \
+            .eq("user_id", user_id) \
+            .in_("canonical_name", canonical_names)
+
+        if entity_type:
+            query = query.eq("entity_type", entity_type)
+
+        result = query.execute()
+        return {e["canonical_name"]: e for e in result.data or []}
+
     @staticmethod
     async def update_entity(
         entity_id: str,
@@ -0,0 +1,70 @@
+"""Pooled direct Postgres connections for hot-path RPCs.
+
+Point SUPABASE_POSTGRES_URL at the Supabase transaction pooler (PgBouncer/Supavisor,
+port 6543) so many client sessions share a few backends. Transaction mode does not
+keep session state, so server-side prepared statements are disabled.
+"""
+
+from typing import Any, Optional
+from psycopg.rows import dict_row
+from psycopg_pool import AsyncConnectionPool
+from jarvis.config import get_settings
+from jarvis.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class PostgresPool:
+    _instance: Optional["PostgresPool"] = None
+    _pool: Optional[AsyncConnectionPool] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    @property
+    def enabled(self) -> bool:
+        """True once connect() opened a pool (SUPABASE_POSTGRES_URL configured)."""
+        return self._pool is not None
+
+    async def connect(self, min_size: int = 4, max_size: int = 20):
+        """Open the pool. Should be called once at application startup."""
+        if self._pool is not None:
+            return
+        settings = get_settings()
+        if not settings.supabase_postgres_url:
+            logger.info("SUPABASE_POSTGRES_URL not set, RPCs go through Supabase REST")
+            return
+        self._pool = AsyncConnectionPool(
+            settings.supabase_postgres_url,
+            min_size=min_size,
+            max_size=max_size,
+            kwargs={"prepare_threshold": None, "row_factory": dict_row},
+            open=False,
+        )
+        await self._pool.open()
+        logger.info("Postgres pool connected")
+
+    async def disconnect(self):
+        """Close the pool. Should be called at application shutdown."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Postgres pool disconnected")
+
+    def _ensure_connected(self) -> AsyncConnectionPool:
+        if self._pool is None:
+            raise RuntimeError("Postgres pool not connected. Call connect() first.")
+        return self._pool
+
+    async def fetch(self, query: str, *params: Any) -> list[dict]:
+        """Run a query on a pooled connection and return all rows as dicts."""
+        pool = self._ensure_connected()
+        async with pool.connection() as conn:
+            cur = await conn.execute(query, params)
+            return await cur.fetchall()
+
+
+# Singleton
+pg_pool = PostgresPool()
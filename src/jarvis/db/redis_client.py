@@ -1,5 +1,5 @@
 import redis.asyncio as redis
-import json
+import orjson
 from typing import Any, Optional
 from jarvis.config import get_settings
 from jarvis.utils.logging import get_logger
@@ -24,7 +24,8 @@ class RedisClient:
             self._client = redis.from_url(
                 settings.redis_url,
                 encoding="utf-8",
-                decode_responses=True
+                decode_responses=True,
+                max_connections=settings.redis_max_connections
             )
             self._connected = True
             logger.info("Redis connected")
@@ -48,13 +49,35 @@ class RedisClient:
         client = self._ensure_connected()
         value = await client.get(key)
         if value:
-            return json.loads(value)
+            return orjson.loads(value)
         return None
 
+    async def mget(self, keys: list[str]) -> list[Optional[Any]]:
+        """Get multiple values in a single round-trip, None for missing keys."""
+        client = self._ensure_connected()
+        values = await client.mget(keys)
+        return [orjson.loads(value) if value else None for value in values]
+
     async def set(self, key: str, value: Any, ttl: int) -> None:
         """Set value in cache with TTL in seconds."""
         client = self._ensure_connected()
-        await client.setex(key, ttl, json.dumps(value, default=str))
+        await client.setex(
+            key, ttl, orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS)
+        )
+
+    async def get_list(self, key: str) -> list[Any]:
+        """Get every item of a list key, [] if missing."""
+        client = self._ensure_connected()
+        return [orjson.loads(value) for value in await client.lrange(key, 0, -1)]
+
+    async def push_capped(self, key: str, values: list[Any], max_len: int, ttl: int) -> None:
+        """Append to a list key, keep its last max_len items and refresh its TTL, atomically in one round-trip."""
+        client = self._ensure_connected()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.rpush(key, *(orjson.dumps(value, default=str) for value in values))
+            pipe.ltrim(key, -max_len, -1)
+            pipe.expire(key, ttl)
+            await pipe.execute()
 
     async def delete(self, key: str) -> None:
         """Delete key from cache."""
@@ -1,6 +1,7 @@
 from typing import Optional, Literal
-from datetime import datetime
+from datetime import datetime, timezone
 from jarvis.db.supabase_client import get_db, run_db
+from jarvis.db.pool import pg_pool
 from jarvis.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -34,8 +35,10 @@ class ChatRepository:
         limit: int = 20
     ) -> list[dict]:
         db = get_db()
+        # idx_chat_history_user_recent serves the filter and order; content comes from the heap.
+        # Skip id/metadata, which the conversation history does not use
         result = await run_db(lambda: db.table("chat_history")
-            .select("*")
+            .select("user_id, role, content, tokens_used, created_at")
             .eq("user_id", user_id)
             .order("created_at", desc=True)
             .limit(limit)
@@ -73,6 +76,13 @@ class MemoryRepository:
         threshold: float = 0.7,
         limit: int = 5
     ) -> list[dict]:
+        if pg_pool.enabled:
+            rows = await pg_pool.fetch(
+                "SELECT * FROM match_memory_facts(%s::halfvec, %s, %s, %s)",
+                str(query_embedding), user_id, threshold, limit
+            )
+            return [{**row, "id": str(row["id"])} for row in rows]
+
         db = get_db()
         result = await run_db(lambda: db.rpc("match_memory_facts", {
             "query_embedding": query_embedding,
@@ -125,6 +135,13 @@ class RAGRepository:
         threshold: float = 0.7,
         limit: int = 5
     ) -> list[dict]:
+        if pg_pool.enabled:
+            rows = await pg_pool.fetch(
+                "SELECT * FROM match_rag_documents(%s::halfvec, %s, %s, %s)",
+                str(query_embedding), user_id, threshold, limit
+            )
+            return [{**row, "id": str(row["id"])} for row in rows]
+
         db = get_db()
         result = await run_db(lambda: db.rpc("match_rag_documents", {
             "query_embedding": query_embedding,
@@ -299,6 +316,39 @@ class TaskRepository:
             return None
         return task
 
+    @staticmethod
+    async def claim_batch(worker_id: str, batch_size: int = 8) -> list[dict]:
+        """Claim atomico fino a batch_size task disponibili in un solo round-trip."""
+        db = get_db()
+        result = await run_db(lambda: db.rpc("claim_next_tasks", {
+            "p_worker_id": worker_id,
+            "p_batch_size": batch_size
+        }).execute())
+        if not result.data:
+            return []
+        tasks = result.data if isinstance(result.data, list) else [result.data]
+        return [task for task in tasks if task and task.get("id") is not None]
+
+    @staticmethod
+    async def get_next_scheduled_at() -> Optional[datetime]:
+        """Prossima scadenza tra i task pendenti (UTC naive), None se la coda è vuota."""
+        db = get_db()
+        result = await run_db(lambda: db.table("task_queue")
+            .select("scheduled_at")
+            .eq("status", "pending")
+            .order("scheduled_at", desc=False, nullsfirst=True)
+            .limit(1)
+            .execute())
+        if not result.data:
+            return None
+        scheduled_at = result.data[0].get("scheduled_at")
+        if not scheduled_at:
+            return datetime.utcnow()
+        parsed = datetime.fromisoformat(scheduled_at)
+        if parsed.tzinfo:
+            parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+        return parsed
+
     @staticmethod
     async def start_task(task_id: str) -> dict:
         """Marca un task come running."""
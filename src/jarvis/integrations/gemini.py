@@ -1,3 +1,4 @@
+import numpy as np
 from google import genai
 from google.genai import types
 from typing import Optional
@@ -8,6 +9,47 @@ from jarvis.utils.llm_logger import LLMLogEntry, llm_logger
 logger = get_logger(__name__)
 
 
+def _l2_normalize(values: list[float]) -> list[float]:
+    """Scale embedding to unit length so inner product equals cosine similarity."""
+    vec = np.asarray(values, dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    if norm == 0:
+        return list(values)
+    return (vec / norm).tolist()
+
+
+def _generation_config(
+    temperature: float,
+    max_tokens: Optional[int],
+    system_instruction: Optional[str]
+) -> types.GenerateContentConfig:
+    """Build a fresh request config for one call.
+
+    Not cached: many system prompts are rendered per request (memory, agent data), so a
+    cache would rarely hit, pin large strings, and share one mutable config across callers.
+    """
+    config = types.GenerateContentConfig(temperature=temperature)
+    if max_tokens is not None:
+        config.max_output_tokens = max_tokens
+    if system_instruction:
+        config.system_instruction = system_instruction
+    return config
+
+
+# Function declarations are module constants in the agents: convert each list once
+_function_tools: dict[int, tuple[list[dict], types.Tool]] = {}
+
+
+def _function_tool(functions: list[dict]) -> types.Tool:
+    """Wrap plain-dict function declarations into a (cached) Gemini Tool."""
+    cached = _function_tools.get(id(functions))
+    if cached is not None and cached[0] is functions:
+        return cached[1]
+    tool = types.Tool(function_declarations=[types.FunctionDeclaration(**f) for f in functions])
+    _function_tools[id(functions)] = (functions, tool)
+    return tool
+
+
 class GeminiClient:
     def __init__(self):
         settings = get_settings()
@@ -46,9 +88,69 @@ class GeminiClient:
         )
         log_entry.start_timer()
 
+        config = _generation_config(temperature, max_tokens, system_instruction)
+
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=model_to_use,
+                contents=prompt,
+                config=config
+            )
+
+            log_entry.stop_timer()
+            log_entry.response = response.text
+            log_entry.finish_reason = "stop"
+
+            # Extract token counts if available
+            if hasattr(response, 'usage_metadata') and response.usage_metadata:
+                log_entry.input_tokens = getattr(response.usage_metadata, 'prompt_token_count', 0)
+                log_entry.output_tokens = getattr(response.usage_metadata, 'candidates_token_count', 0)
+                log_entry.cached_tokens = getattr(response.usage_metadata, 'cached_content_token_count', 0)
+
+            await llm_logger.log(log_entry)
+            return response.text
+
+        except Exception as e:
+            log_entry.stop_timer()
+            log_entry.is_error = True
+            log_entry.error_message = str(e)
+            await llm_logger.log(log_entry)
+            raise
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        functions: list[dict],
+        system_instruction: str = None,
+        model: str = None,
+        temperature: float = 0.7,
+        max_tokens: int = 4096,
+        user_id: str = None
+    ) -> tuple[list[dict], str]:
+        """Generate with native function calling.
+
+        Returns the requested calls as [{"tool": name, "params": args}, ...] and the
+        text the model answered with (empty when it only called functions).
+        """
+        model_to_use = model or self.default_model
+        effective_user_id = user_id or self._current_user_id
+
+        log_entry = LLMLogEntry(
+            provider="gemini",
+            model=model_to_use,
+            user_prompt=prompt,
+            system_prompt=system_instruction,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            user_id=effective_user_id,
+        )
+        log_entry.start_timer()
+
         config = types.GenerateContentConfig(
             temperature=temperature,
             max_output_tokens=max_tokens,
+            tools=[_function_tool(functions)],
+            automatic_function_calling=types.AutomaticFunctionCallingConfig(disable=True),
         )
 
         if system_instruction:
@@ -61,18 +163,28 @@ class GeminiClient:
                 config=config
             )
 
+            calls = [
+                {"tool": fc.name, "params": dict(fc.args or {})}
+                for fc in response.function_calls or []
+            ]
+            text_parts = []
+            if response.candidates and response.candidates[0].content:
+                for part in response.candidates[0].content.parts or []:
+                    if part.text:
+                        text_parts.append(part.text)
+            text = "".join(text_parts)
+
             log_entry.stop_timer()
-            log_entry.response = response.text
-            log_entry.finish_reason = "stop"
+            log_entry.response = text or str(calls)
+            log_entry.finish_reason = "tool_calls" if calls else "stop"
 
-            # Extract token counts if available
             if hasattr(response, 'usage_metadata') and response.usage_metadata:
                 log_entry.input_tokens = getattr(response.usage_metadata, 'prompt_token_count', 0)
                 log_entry.output_tokens = getattr(response.usage_metadata, 'candidates_token_count', 0)
                 log_entry.cached_tokens = getattr(response.usage_metadata, 'cached_content_token_count', 0)
 
             await llm_logger.log(log_entry)
-            return response.text
+            return calls, text
 
         except Exception as e:
             log_entry.stop_timer()
@@ -120,12 +232,7 @@ class GeminiClient:
                 parts=[types.Part(text=msg["content"])]
             ))
 
-        config = types.GenerateContentConfig(
-            temperature=temperature,
-        )
-
-        if system_instruction:
-            config.system_instruction = system_instruction
+        config = _generation_config(temperature, None, system_instruction)
 
         try:
             response = await self.client.aio.models.generate_content(
@@ -178,13 +285,7 @@ class GeminiClient:
         )
         log_entry.start_timer()
 
-        config = types.GenerateContentConfig(
-            temperature=temperature,
-            max_output_tokens=max_tokens,
-        )
-
-        if system_instruction:
-            config.system_instruction = system_instruction
+        config = _generation_config(temperature, max_tokens, system_instruction)
 
         full_response = []
         try:
@@ -202,6 +303,14 @@ class GeminiClient:
             log_entry.finish_reason = "stop"
             await llm_logger.log(log_entry)
 
+        except GeneratorExit:
+            # Consumer stopped early (e.g. it already has a complete JSON value)
+            log_entry.stop_timer()
+            log_entry.response = "".join(full_response)
+            log_entry.finish_reason = "client_closed"
+            await llm_logger.log(log_entry)
+            raise
+
         except Exception as e:
             log_entry.stop_timer()
             log_entry.is_error = True
@@ -210,25 +319,25 @@ class GeminiClient:
             raise
 
     async def embed(self, text: str) -> list[float]:
-        """Generate embedding for text."""
+        """Generate L2-normalized embedding for text."""
         try:
             response = await self.client.aio.models.embed_content(
                 model=self.embedding_model,
                 contents=text
             )
-            return response.embeddings[0].values
+            return _l2_normalize(response.embeddings[0].values)
         except Exception as e:
             logger.error(f"Embedding failed for model {self.embedding_model}: {e}")
             raise
 
     async def embed_batch(self, texts: list[str]) -> list[list[float]]:
-        """Generate embeddings for multiple texts."""
+        """Generate L2-normalized embeddings for multiple texts."""
         try:
             response = await self.client.aio.models.embed_content(
                 model=self.embedding_model,
                 contents=texts
             )
-            return [emb.values for emb in response.embeddings]
+            return [_l2_normalize(emb.values) for emb in response.embeddings]
         except Exception as e:
             logger.error(f"Batch embedding failed for model {self.embedding_model}: {e}")
             raise
@@ -1,13 +1,19 @@
 import base64
+import threading
 from email.mime.text import MIMEText
 from typing import Optional
+import httplib2
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
 from jarvis.config import get_settings
 from jarvis.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Gmail advises against batches larger than 50 requests (rate limiting)
+BATCH_LIMIT = 50
+
 
 class GmailClient:
     def __init__(self):
@@ -20,6 +26,15 @@ class GmailClient:
             token_uri="https://oauth2.googleapis.com/token"
         )
         self.service = build("gmail", "v1", credentials=self.credentials)
+        self._local = threading.local()
+
+    def _http(self) -> AuthorizedHttp:
+        """Per-thread authorized transport: httplib2.Http is not thread-safe and
+        the email agent runs these methods on a thread pool."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return http
 
     def get_inbox(
         self,
@@ -45,7 +60,7 @@ class GmailClient:
             userId="me",
             maxResults=max_results,
             q=q or None
-        ).execute()
+        ).execute(http=self._http())
 
         messages = results.get("messages", [])
 
@@ -72,7 +87,7 @@ class GmailClient:
             id=message_id,
             format="metadata",
             metadataHeaders=["From", "To", "Subject", "Date"]
-        ).execute()
+        ).execute(http=self._http())
 
         headers = message.get("payload", {}).get("headers", [])
 
@@ -100,7 +115,7 @@ class GmailClient:
             userId="me",
             id=message_id,
             format="full"
-        ).execute()
+        ).execute(http=self._http())
 
         headers = message.get("payload", {}).get("headers", [])
 
@@ -135,6 +150,31 @@ class GmailClient:
         bcc: str = None
     ) -> dict:
         """Send an email."""
+        result = self._send_request(to, subject, body, cc=cc, bcc=bcc).execute(http=self._http())
+
+        return {"id": result["id"], "status": "sent"}
+
+    def batch_send_emails(self, messages: list[dict]) -> list[dict | Exception]:
+        """Send several emails in one batch HTTP round-trip.
+
+        Each item holds send_email keyword arguments. Results come back in input order:
+        the send result, or the exception raised for that message.
+        """
+        results: list[dict | Exception | None] = [None] * len(messages)
+
+        def on_response(request_id, response, exception):
+            index = int(request_id)
+            results[index] = exception if exception is not None else {"id": response["id"], "status": "sent"}
+
+        for offset in range(0, len(messages), BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for index, kwargs in enumerate(messages[offset:offset + BATCH_LIMIT], offset):
+                batch.add(self._send_request(**kwargs), request_id=str(index))
+            batch.execute(http=self._http())
+        return results
+
+    def _send_request(self, to: str, subject: str, body: str, cc: str = None, bcc: str = None):
+        """Build (without executing) the messages.send request for a plain-text email."""
         message = MIMEText(body)
         message["to"] = to
         message["subject"] = subject
@@ -146,12 +186,10 @@ class GmailClient:
 
         raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
 
-        result = self.service.users().messages().send(
+        return self.service.users().messages().send(
             userId="me",
             body={"raw": raw}
-        ).execute()
-
-        return {"id": result["id"], "status": "sent"}
+        )
 
     def reply_email(
         self,
@@ -176,7 +214,7 @@ class GmailClient:
                 "raw": raw,
                 "threadId": original["thread_id"]
             }
-        ).execute()
+        ).execute(http=self._http())
 
         return {"id": result["id"], "status": "sent"}
 
@@ -204,7 +242,7 @@ class GmailClient:
         result = self.service.users().drafts().create(
             userId="me",
             body={"message": {"raw": raw}}
-        ).execute()
+        ).execute(http=self._http())
 
         return {"id": result["id"], "message_id": result["message"]["id"], "status": "draft_created"}
 
@@ -218,7 +256,7 @@ class GmailClient:
             userId="me",
             id=message_id,
             body={"removeLabelIds": ["UNREAD"]}
-        ).execute()
+        ).execute(http=self._http())
         return True
 
     def _get_body(self, payload: dict) -> str:
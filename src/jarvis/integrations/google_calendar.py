@@ -1,12 +1,23 @@
+import asyncio
+import threading
 from datetime import datetime, timedelta
 from typing import Optional
+from urllib.parse import quote
+import httplib2
+import httpx
+import orjson
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp, Request
 from googleapiclient.discovery import build
 from jarvis.config import get_settings
 from jarvis.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+CALENDAR_API_URL = "https://www.googleapis.com/calendar/v3"
+# Calendar API limit on requests per batch HTTP call
+BATCH_LIMIT = 50
+
 
 class GoogleCalendarClient:
     def __init__(self):
@@ -19,33 +30,137 @@ class GoogleCalendarClient:
             token_uri="https://oauth2.googleapis.com/token"
         )
         self.service = build("calendar", "v3", credentials=self.credentials)
+        self._local = threading.local()
+        # Async REST transport for the read path (pooled, no thread hop)
+        self._client: httpx.AsyncClient | None = None
+        self._refresh_lock = asyncio.Lock()
+
+    def _http(self) -> AuthorizedHttp:
+        """Per-thread authorized transport: httplib2.Http is not thread-safe and
+        callers run these methods via asyncio.to_thread."""
+        http = getattr(self._local, "http", None)
+        if http is None:
+            http = self._local.http = AuthorizedHttp(self.credentials, http=httplib2.Http())
+        return http
 
     def get_events(
         self,
         start: datetime = None,
         end: datetime = None,
         max_results: int = 50,
-        calendar_id: str = "primary"
+        calendar_id: str = "primary",
+        query: Optional[str] = None
     ) -> list[dict]:
-        """Fetch calendar events."""
+        """Fetch calendar events, optionally full-text filtered server-side by query."""
         if not start:
             start = datetime.utcnow()
         if not end:
             end = start + timedelta(days=7)
 
-        events_result = self.service.events().list(
-            calendarId=calendar_id,
-            timeMin=start.isoformat() + "Z",
-            timeMax=end.isoformat() + "Z",
-            maxResults=max_results,
-            singleEvents=True,
-            orderBy="startTime"
-        ).execute()
+        list_params = {
+            "calendarId": calendar_id,
+            "timeMin": start.isoformat() + "Z",
+            "timeMax": end.isoformat() + "Z",
+            "maxResults": max_results,
+            "singleEvents": True,
+            "orderBy": "startTime",
+        }
+        if query:
+            list_params["q"] = query
+
+        events_result = self.service.events().list(**list_params).execute(http=self._http())
 
         events = events_result.get("items", [])
 
         return [self._format_event(e) for e in events]
 
+    async def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=CALENDAR_API_URL,
+                timeout=30.0,
+                http2=True,
+                limits=httpx.Limits(max_connections=16, max_keepalive_connections=16),
+            )
+        return self._client
+
+    async def _auth_headers(self, force_refresh: bool = False) -> dict:
+        """Bearer header from the shared credentials, refreshing the access token when needed."""
+        async with self._refresh_lock:
+            if force_refresh or not self.credentials.valid:
+                await asyncio.to_thread(self.credentials.refresh, Request(httplib2.Http()))
+        return {"Authorization": f"Bearer {self.credentials.token}"}
+
+    async def _request(self, method: str, path: str, **kwargs) -> dict:
+        """Authorized Calendar REST call; retries once with a fresh token on 401."""
+        client = await self._get_client()
+        headers = kwargs.pop("headers", {})
+        response = await client.request(method, path, headers={**headers, **await self._auth_headers()}, **kwargs)
+        if response.status_code == 401:
+            response = await client.request(
+                method, path, headers={**headers, **await self._auth_headers(force_refresh=True)}, **kwargs
+            )
+        response.raise_for_status()
+        return orjson.loads(response.content)
+
+    async def get_events_async(
+        self,
+        start: datetime = None,
+        end: datetime = None,
+        max_results: int = 50,
+        calendar_id: str = "primary",
+        query: Optional[str] = None
+    ) -> list[dict]:
+        """Async get_events over the pooled REST client."""
+        if not start:
+            start = datetime.utcnow()
+        if not end:
+            end = start + timedelta(days=7)
+
+        list_params = {
+            "timeMin": start.isoformat() + "Z",
+            "timeMax": end.isoformat() + "Z",
+            "maxResults": max_results,
+            "singleEvents": "true",
+            "orderBy": "startTime",
+        }
+        if query:
+            list_params["q"] = query
+
+        events_result = await self._request(
+            "GET", f"/calendars/{quote(calendar_id, safe='')}/events", params=list_params
+        )
+        return [self._format_event(e) for e in events_result.get("items", [])]
+
+    async def find_free_slots_async(
+        self,
+        duration_minutes: int,
+        start: datetime = None,
+        end: datetime = None,
+        calendar_id: str = "primary"
+    ) -> list[dict]:
+        """Async find_free_slots over the pooled REST client."""
+        if not start:
+            start = datetime.utcnow()
+        if not end:
+            end = start + timedelta(days=7)
+
+        body = {
+            "timeMin": start.isoformat() + "Z",
+            "timeMax": end.isoformat() + "Z",
+            "items": [{"id": calendar_id}]
+        }
+        result = await self._request(
+            "POST", "/freeBusy", content=orjson.dumps(body), headers={"Content-Type": "application/json"}
+        )
+        return self._free_slots(result["calendars"][calendar_id]["busy"], duration_minutes, start, end)
+
+    async def close(self):
+        """Close the async REST client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     def create_event(
         self,
         title: str,
@@ -58,6 +173,62 @@ class GoogleCalendarClient:
         calendar_id: str = "primary"
     ) -> dict:
         """Create a new calendar event with optional Google Meet link."""
+        request = self._insert_request(
+            title, start, end, description, location, attendees, add_meet, calendar_id
+        )
+        return self._format_event(request.execute(http=self._http()))
+
+    def batch_create_events(self, events: list[dict]) -> list[dict | Exception]:
+        """Create several events in one batch HTTP round-trip.
+
+        Each item holds create_event keyword arguments. Results come back in input order:
+        the formatted event, or the exception raised for that insert.
+        """
+        results: list[dict | Exception | None] = [None] * len(events)
+
+        def on_response(request_id, response, exception):
+            index = int(request_id)
+            results[index] = exception if exception is not None else self._format_event(response)
+
+        for offset in range(0, len(events), BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for index, kwargs in enumerate(events[offset:offset + BATCH_LIMIT], offset):
+                batch.add(self._insert_request(**kwargs), request_id=str(index))
+            batch.execute(http=self._http())
+        return results
+
+    def batch_delete_events(self, event_ids: list[str], calendar_id: str = "primary") -> list[bool | Exception]:
+        """Delete several events in one batch HTTP round-trip.
+
+        Results come back in input order: True, or the exception raised for that delete.
+        """
+        results: list[bool | Exception | None] = [None] * len(event_ids)
+
+        def on_response(request_id, response, exception):
+            results[int(request_id)] = exception if exception is not None else True
+
+        for offset in range(0, len(event_ids), BATCH_LIMIT):
+            batch = self.service.new_batch_http_request(callback=on_response)
+            for index, event_id in enumerate(event_ids[offset:offset + BATCH_LIMIT], offset):
+                batch.add(
+                    self.service.events().delete(calendarId=calendar_id, eventId=event_id),
+                    request_id=str(index)
+                )
+            batch.execute(http=self._http())
+        return results
+
+    def _insert_request(
+        self,
+        title: str,
+        start: datetime,
+        end: datetime,
+        description: str = None,
+        location: str = None,
+        attendees: list[str] = None,
+        add_meet: bool = False,
+        calendar_id: str = "primary"
+    ):
+        """Build (without executing) the events.insert request for create_event."""
         event = {
             "summary": title,
             "start": {"dateTime": start.isoformat(), "timeZone": "Europe/Rome"},
@@ -80,14 +251,12 @@ class GoogleCalendarClient:
                 }
             }
 
-        result = self.service.events().insert(
+        return self.service.events().insert(
             calendarId=calendar_id,
             body=event,
             sendUpdates="all" if attendees else "none",
             conferenceDataVersion=1 if (add_meet or attendees) else 0
-        ).execute()
-
-        return self._format_event(result)
+        )
 
     def update_event(
         self,
@@ -100,7 +269,7 @@ class GoogleCalendarClient:
         event = self.service.events().get(
             calendarId=calendar_id,
             eventId=event_id
-        ).execute()
+        ).execute(http=self._http())
 
         # Apply updates
         if "title" in updates:
@@ -118,7 +287,7 @@ class GoogleCalendarClient:
             calendarId=calendar_id,
             eventId=event_id,
             body=event
-        ).execute()
+        ).execute(http=self._http())
 
         return self._format_event(result)
 
@@ -131,7 +300,7 @@ class GoogleCalendarClient:
         self.service.events().delete(
             calendarId=calendar_id,
             eventId=event_id
-        ).execute()
+        ).execute(http=self._http())
         return True
 
     def find_free_slots(
@@ -154,9 +323,12 @@ class GoogleCalendarClient:
             "items": [{"id": calendar_id}]
         }
 
-        result = self.service.freebusy().query(body=body).execute()
-        busy_times = result["calendars"][calendar_id]["busy"]
+        result = self.service.freebusy().query(body=body).execute(http=self._http())
+        return self._free_slots(result["calendars"][calendar_id]["busy"], duration_minutes, start, end)
 
+    @staticmethod
+    def _free_slots(busy_times: list[dict], duration_minutes: int, start: datetime, end: datetime) -> list[dict]:
+        """Free working-hours slots between start and end, given the freebusy busy intervals."""
         # Find free slots (simplified - between 9 AM and 6 PM)
         free_slots = []
         current = start.replace(hour=9, minute=0, second=0, microsecond=0)
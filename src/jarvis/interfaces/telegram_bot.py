@@ -1,5 +1,6 @@
 import asyncio
 import random
+import re
 from telegram import Update
 from telegram.ext import (
     Application,
@@ -38,6 +39,13 @@ settings = get_settings()
 MAX_TURNS = 10  # 10 exchanges = 20 messages (human + AI)
 CONVERSATION_TTL = 48 * 60 * 60  # 48 hours in seconds
 
+# Time words that can lead a /promemoria message, matched as substrings in one scan
+_TIME_WORD_RE = re.compile(
+    "alle|dopo|fra|tra|domani|oggi"
+    "|lunedi|martedi|mercoledi|giovedi|venerdi|sabato|domenica"
+    "|prossimo|prossima|minuti|ore|giorni"
+)
+
 
 class RedisConversationCache:
     """Redis-backed conversation history with TTL."""
@@ -45,7 +53,8 @@ class RedisConversationCache:
     def __init__(self, max_turns: int = MAX_TURNS, ttl: int = CONVERSATION_TTL):
         self._max_turns = max_turns
         self._ttl = ttl
-        self._key_prefix = "jarvis:chat:"
+        # One Redis list per user, capped at max_turns * 2 messages
+        self._key_prefix = "jarvis:chat:list:"
 
     def _key(self, user_id: str) -> str:
         return f"{self._key_prefix}{user_id}"
@@ -53,7 +62,7 @@ class RedisConversationCache:
     async def get(self, user_id: str) -> list:
         """Get conversation history for user from Redis."""
         try:
-            data = await redis_client.get(self._key(user_id))
+            data = await redis_client.get_list(self._key(user_id))
             if data:
                 # Reconstruct message objects from stored data
                 messages = []
@@ -70,20 +79,16 @@ class RedisConversationCache:
     async def update(self, user_id: str, user_message: str, assistant_response: str):
         """Update conversation history in Redis."""
         try:
-            # Get existing history
-            data = await redis_client.get(self._key(user_id)) or []
-
-            # Add new messages
-            data.append({"type": "human", "content": user_message})
-            data.append({"type": "ai", "content": assistant_response})
-
-            # Trim to max turns (each turn = 2 messages)
-            max_messages = self._max_turns * 2
-            if len(data) > max_messages:
-                data = data[-max_messages:]
-
-            # Save with TTL
-            await redis_client.set(self._key(user_id), data, self._ttl)
+            # Append, trim to max turns (each turn = 2 messages) and refresh the TTL in one atomic round-trip
+            await redis_client.push_capped(
+                self._key(user_id),
+                [
+                    {"type": "human", "content": user_message},
+                    {"type": "ai", "content": assistant_response},
+                ],
+                self._max_turns * 2,
+                self._ttl,
+            )
 
         except Exception as e:
             logger.error(f"Redis update conversation failed: {e}")
@@ -301,15 +306,10 @@ async def remind_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         if parsed_date:
             # Find where the date expression ends
             # Simple heuristic: the message starts after common time words
-            time_words = [
-                "alle", "dopo", "fra", "tra", "domani", "oggi",
-                "lunedi", "martedi", "mercoledi", "giovedi", "venerdi", "sabato", "domenica",
-                "prossimo", "prossima", "minuti", "ore", "giorni"
-            ]
             words = full_text.split()
             msg_start = 0
             for i, word in enumerate(words):
-                if any(tw in word.lower() for tw in time_words) or word[0].isdigit():
+                if _TIME_WORD_RE.search(word.lower()) or word[0].isdigit():
                     msg_start = i + 1
                 else:
                     break
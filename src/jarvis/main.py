@@ -1,6 +1,8 @@
 import asyncio
 from jarvis.utils.logging import setup_logging, get_logger
 from jarvis.db.redis_client import redis_client
+from jarvis.db.pool import pg_pool
+from jarvis.integrations.google_calendar import calendar_client
 from jarvis.interfaces.telegram_bot import run_bot
 
 
@@ -25,11 +27,16 @@ async def main():
     # Connect to Redis
     await redis_client.connect()
 
+    # Open pooled Postgres connections (no-op without SUPABASE_POSTGRES_URL)
+    await pg_pool.connect()
+
     try:
         # Run Telegram bot
         await run_bot()
     finally:
         # Cleanup
+        await calendar_client.close()
+        await pg_pool.disconnect()
         await redis_client.disconnect()
         fcntl.flock(lock_file, fcntl.LOCK_UN)
         lock_file.close()
@@ -3,7 +3,7 @@
 from jarvis.integrations.openai_embeddings import openai_embeddings
 from jarvis.integrations.gemini import gemini
 from jarvis.integrations.reranker import reranker
-from jarvis.db.supabase_client import get_db
+from jarvis.db.supabase_client import get_db, run_db
 from jarvis.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -45,7 +45,7 @@ class HybridRAG:
         # Call hybrid search function in PostgreSQL
         db = get_db()
         try:
-            result = db.rpc("search_rag_hybrid", {
+            result = await run_db(lambda: db.rpc("search_rag_hybrid", {
                 "query_embedding": query_embedding,
                 "search_query": query,
                 "match_user_id": user_id,
@@ -53,7 +53,7 @@ class HybridRAG:
                 "fulltext_weight": 0.3,
                 "match_threshold": semantic_threshold,
                 "match_count": self.rerank_candidates if use_reranker else limit
-            }).execute()
+            }).execute())
 
             docs = result.data if result.data else []
 
@@ -83,12 +83,12 @@ class HybridRAG:
 
         db = get_db()
         try:
-            result = db.rpc("match_rag_chunks", {
+            result = await run_db(lambda: db.rpc("match_rag_chunks", {
                 "query_embedding": query_embedding,
                 "match_user_id": user_id,
                 "match_threshold": threshold,
                 "match_count": limit
-            }).execute()
+            }).execute())
             return result.data if result.data else []
         except Exception as e:
             logger.error(f"Semantic search failed: {e}")
@@ -103,11 +103,11 @@ class HybridRAG:
         """Full-text search only (no semantic, no reranking)."""
         db = get_db()
         try:
-            result = db.rpc("search_rag_chunks_fulltext", {
+            result = await run_db(lambda: db.rpc("search_rag_chunks_fulltext", {
                 "search_query": query,
                 "match_user_id": user_id,
                 "match_count": limit
-            }).execute()
+            }).execute())
             return result.data if result.data else []
         except Exception as e:
             logger.error(f"Full-text search failed: {e}")
@@ -185,12 +185,12 @@ RISPOSTA:"""
         """Fallback to semantic-only search if hybrid fails."""
         db = get_db()
         try:
-            result = db.rpc("match_rag_chunks", {
+            result = await run_db(lambda: db.rpc("match_rag_chunks", {
                 "query_embedding": query_embedding,
                 "match_user_id": user_id,
                 "match_threshold": threshold,
                 "match_count": limit
-            }).execute()
+            }).execute())
             return result.data if result.data else []
         except Exception as e:
             logger.error(f"Semantic fallback also failed: {e}")
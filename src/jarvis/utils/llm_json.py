@@ -0,0 +1,33 @@
+"""Helpers for the JSON the agents exchange with the LLM."""
+
+import re
+from typing import Any
+import orjson
+
+# ```json ... ``` fence around the model's JSON reply
+_FENCE_RE = re.compile(r"^```(?:json)?\s*(.*?)\s*```", re.DOTALL)
+# Opening fence of a reply truncated before the closing one
+_OPEN_FENCE_RE = re.compile(r"^```(?:json)?\s*")
+
+
+def tools_json(tools: list[dict]) -> str:
+    """Serialize an agent's tool schema for its system prompt.
+
+    Compact on purpose: indentation would only add prompt tokens. Agents call this once
+    at import and format the result into a module-level prompt constant.
+    """
+    return orjson.dumps(tools).decode()
+
+
+def parse_llm_json(text: str) -> Any:
+    """Parse a model reply that may be wrapped in a Markdown code fence.
+
+    Raises orjson.JSONDecodeError (a ValueError) when the payload is not valid JSON.
+    """
+    clean = text.strip()
+    match = _FENCE_RE.match(clean)
+    if match:
+        clean = match.group(1)
+    else:
+        clean = _OPEN_FENCE_RE.sub("", clean, count=1)
+    return orjson.loads(clean)
@@ -1,7 +1,41 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import sys
+from typing import Any
 import structlog
 from jarvis.config import get_settings
 
+_listener: logging.handlers.QueueListener | None = None
+_loggers: dict[str, Any] = {}
+
+# Stdlib logger behind every structlog logger. It does not propagate, so the root logger and
+# third-party libraries (httpx, googleapiclient, telegram, ...) keep their default WARNING output.
+_SINK_LOGGER_NAME = "jarvis.log_sink"
+
+
+def _setup_queue_sink() -> logging.Logger:
+    """Route rendered log lines through a queue so stdout writes happen on a background thread."""
+    global _listener
+    sink = logging.getLogger(_SINK_LOGGER_NAME)
+    if _listener is not None:
+        return sink
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    sink.handlers = [logging.handlers.QueueHandler(log_queue)]
+    sink.propagate = False
+    # Level filtering is done by structlog's filtering bound logger
+    sink.setLevel(logging.DEBUG)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return sink
+
 
 def setup_logging():
     settings = get_settings()
@@ -17,16 +51,23 @@ def setup_logging():
     else:
         processors.append(structlog.processors.JSONRenderer())
 
+    sink = _setup_queue_sink()
+
     structlog.configure(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(
             getattr(logging, settings.log_level.upper(), logging.INFO)
         ),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(),
+        # Logger names are not rendered, so every structlog logger can share the sink
+        logger_factory=lambda *args: sink,
         cache_logger_on_first_use=True,
     )
 
 
 def get_logger(name: str):
-    return structlog.get_logger(name)
+    # Agents are constructed per request: reuse one lazy proxy per name
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = structlog.get_logger(name)
+    return logger
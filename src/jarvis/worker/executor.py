@@ -504,7 +504,7 @@ Scrivi un messaggio breve in italiano, usa emoji per rendere il tutto leggibile.
 
     async def _handle_daily_briefing(self, user_id: str, payload: dict) -> dict:
         """Handle daily briefing - morning or evening digest."""
-        from jarvis.integrations.google_calendar import GoogleCalendarClient
+        from jarvis.integrations.google_calendar import calendar_client
         from jarvis.integrations.gmail import GmailClient
         from jarvis.integrations.notion import notion_client
         from jarvis.integrations.gemini import gemini
@@ -524,10 +524,9 @@ Scrivi un messaggio breve in italiano, usa emoji per rendere il tutto leggibile.
 
             # === CALENDAR EVENTS ===
             try:
-                calendar_client = GoogleCalendarClient()
                 if briefing_type == "morning":
                     # Morning: today's events
-                    events = calendar_client.get_events(
+                    events = await calendar_client.get_events_async(
                         start=today_start,
                         end=today_end,
                         max_results=20
@@ -541,7 +540,7 @@ Scrivi un messaggio breve in italiano, usa emoji per rendere il tutto leggibile.
                         briefing_parts.append("EVENTI DI OGGI: Nessun evento in agenda.")
                 else:
                     # Evening: tomorrow's events preview
-                    events = calendar_client.get_events(
+                    events = await calendar_client.get_events_async(
                         start=tomorrow_start,
                         end=tomorrow_end,
                         max_results=20
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 
 from jarvis.config import get_settings
 from jarvis.db.repositories import TaskRepository
+from jarvis.db.redis_client import redis_client
+from jarvis.integrations.google_calendar import calendar_client
 from jarvis.worker.executor import executor
 from jarvis.worker.notifier import notifier
 from jarvis.utils.logging import get_logger
@@ -22,7 +24,12 @@ class Worker:
         self.poll_interval_active = settings.worker_poll_interval_active
         self.poll_interval_idle = settings.worker_poll_interval_idle
         self.stale_timeout = settings.worker_stale_timeout_minutes
+        self.claim_batch_size = settings.worker_claim_batch_size
+        self.listen_fallback_interval = settings.worker_listen_fallback_interval
         self._running = False
+        self._listening = False
+        self._wakeup = asyncio.Event()
+        self._listener_task: asyncio.Task | None = None
         self._idle_count = 0
         self._last_cleanup = datetime.utcnow()
 
@@ -112,6 +119,13 @@ class Worker:
         for sig in (signal.SIGTERM, signal.SIGINT):
             loop.add_signal_handler(sig, self._handle_shutdown)
 
+        # Agents run by the executor read/write the shared freshness cache
+        await redis_client.connect()
+
+        # Push notifications for new tasks (falls back to plain polling if not configured)
+        if settings.supabase_postgres_direct_url:
+            self._listener_task = asyncio.create_task(self._listen_loop())
+
         logger.info(f"Worker {self.worker_id} ready, starting poll loop")
 
         await self._init_scheduled_tasks()
@@ -128,19 +142,64 @@ class Worker:
         logger.info(f"Worker {self.worker_id} received shutdown signal")
         self._running = False
 
+    async def _listen_loop(self):
+        """Keep a LISTEN task_new session open and wake the poll loop on every notification."""
+        import psycopg
+
+        while self._running:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    settings.supabase_postgres_direct_url, autocommit=True
+                ) as conn:
+                    await conn.execute("LISTEN task_new")
+                    self._listening = True
+                    logger.info(f"Worker {self.worker_id} listening on task_new")
+                    async for _ in conn.notifies():
+                        self._wakeup.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task listener disconnected: {e}")
+            finally:
+                self._listening = False
+            # Reconnect after a short pause; polling keeps working meanwhile
+            await asyncio.sleep(5)
+
+    async def _idle_wait(self, sleep_time: float):
+        """Sleep until sleep_time elapses or a task notification arrives."""
+        if self._listening:
+            # Nothing to poll for: wake on NOTIFY, on the next scheduled task, or on the safety net
+            sleep_time = self.listen_fallback_interval
+            next_due = await TaskRepository.get_next_scheduled_at()
+            if next_due:
+                until_due = (next_due - datetime.utcnow()).total_seconds()
+                # Floor: a due task we cannot claim (clock skew vs NOW(), row locked by
+                # another worker) must not turn this into a busy loop
+                sleep_time = max(min(sleep_time, until_due), self.poll_interval_active)
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_time)
+        except asyncio.TimeoutError:
+            pass
+
     async def _poll_loop(self):
         """Main polling loop."""
         while self._running:
+            # Clear before claiming so a NOTIFY arriving mid-cycle is not lost
+            self._wakeup.clear()
             try:
-                # Try to claim a task
-                task = await TaskRepository.claim_next(self.worker_id)
+                # Try to claim a batch of tasks (one round-trip)
+                tasks = await TaskRepository.claim_batch(self.worker_id, self.claim_batch_size)
 
-                if task:
+                if tasks:
                     # Reset idle counter
                     self._idle_count = 0
 
-                    # Execute the task
-                    await executor.execute(task)
+                    # Execute the claimed tasks concurrently
+                    await asyncio.gather(
+                        *(executor.execute(task) for task in tasks),
+                        return_exceptions=True
+                    )
 
                     # Use active polling interval
                     await asyncio.sleep(self.poll_interval_active)
@@ -153,7 +212,7 @@ class Worker:
                         self.poll_interval_idle * (1 + self._idle_count * 0.1),
                         5.0  # Max 5 seconds
                     )
-                    await asyncio.sleep(sleep_time)
+                    await self._idle_wait(sleep_time)
 
                 # Periodic cleanup of stale tasks
                 await self._maybe_cleanup_stale()
@@ -178,7 +237,11 @@ class Worker:
     async def _cleanup(self):
         """Cleanup resources before shutdown."""
         logger.info(f"Worker {self.worker_id} cleaning up...")
+        if self._listener_task:
+            self._listener_task.cancel()
         await notifier.close()
+        await calendar_client.close()
+        await redis_client.disconnect()
         logger.info(f"Worker {self.worker_id} stopped")
 
 
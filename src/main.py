@@ -20,13 +20,15 @@ logger.remove()
 logger.add(
     sys.stdout,
     format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan> - <level>{message}</level>",
-    level=os.getenv("LOG_LEVEL", "INFO")
+    level=os.getenv("LOG_LEVEL", "INFO"),
+    enqueue=True,  # Format/write on loguru's background thread, not the event loop
 )
 logger.add(
     "/app/logs/agents_{time:YYYY-MM-DD}.log",
     rotation="00:00",
     retention="30 days",
-    level="DEBUG"
+    level="DEBUG",
+    enqueue=True,
 )
 
 
@@ -0,0 +1,254 @@
+"""
+Test per il calendar agent.
+
+Verifica:
+1. Fast route deterministico: solo le richieste d'agenda banali saltano l'LLM
+2. Date scelte dal fast route (oggi, domani, questa settimana)
+3. Scorciatoia "un solo risultato -> elimina" solo su match reali di search_events
+4. Creazioni multiple via batch: ordine dei risultati, errori per evento, invalidazione cache
+5. Eliminazioni multiple via batch: stesse garanzie, event_id mancante senza chiamata
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from jarvis.agents.calendar_agent import CalendarAgent, _fast_route, _title_matches_request
+
+TODAY = "2026-10-15"  # Giovedì
+TOMORROW = "2026-10-16"
+
+
+# =============================================================================
+# TEST: Fast route
+# =============================================================================
+
+class TestFastRoute:
+    """Test routing deterministico delle richieste d'agenda."""
+
+    @pytest.mark.parametrize("phrase, start, end", [
+        ("agenda domani", TOMORROW, TOMORROW),
+        ("cosa ho oggi?", TODAY, TODAY),
+        ("Che eventi ho domani", TOMORROW, TOMORROW),
+        ("mostrami l'agenda di oggi", TODAY, TODAY),
+        ("impegni per domani", TOMORROW, TOMORROW),
+        ("cosa c'è in programma oggi", TODAY, TODAY),
+        ("  cosa   ho   domani  ", TOMORROW, TOMORROW),
+        ("che cosa ho in agenda questa settimana", TODAY, "2026-10-18"),
+    ])
+    def test_matching_phrases(self, phrase, start, end):
+        """Le richieste banali diventano get_events sul giorno giusto."""
+        assert _fast_route(phrase, TODAY, TOMORROW) == {
+            "tool": "get_events",
+            "params": {"start_date": start, "end_date": end},
+        }
+
+    @pytest.mark.parametrize("phrase", [
+        "agendadomani",
+        "cosa ho oggi alle 10",
+        "sposta l'evento di domani",
+        "cosa ho fatto oggi",
+        "eventi di dopodomani",
+        "che eventi ho domani con mario",
+        "crea un evento domani",
+        "agenda",
+    ])
+    def test_non_matching_phrases(self, phrase):
+        """Tutto il resto va all'LLM."""
+        assert _fast_route(phrase, TODAY, TOMORROW) is None
+
+    def test_week_ending_on_sunday(self):
+        """Di domenica "questa settimana" è solo oggi."""
+        decision = _fast_route("agenda questa settimana", "2026-10-18", "2026-10-19")
+        assert decision["params"] == {"start_date": "2026-10-18", "end_date": "2026-10-18"}
+
+
+# =============================================================================
+# TEST: Single-match delete shortcut
+# =============================================================================
+
+def _agent_with_mocks() -> CalendarAgent:
+    agent = CalendarAgent()
+    agent._execute_tool = AsyncMock(return_value={"operation": "delete_event", "message": "Evento eliminato"})
+    agent._decide = AsyncMock(return_value={"tool": "none", "params": {}})
+    return agent
+
+
+class TestSingleMatchDelete:
+    """Test eliminazione diretta senza step 2."""
+
+    @pytest.mark.parametrize("title, query, request, expected", [
+        ("Riunione con Marco", "riunione", "cancella la riunione con marco", True),
+        ("Riunione con Marco", "riunione marco", "cancella la riunione con marco", True),
+        ("Dentista", "riunione", "cancella la riunione", False),
+        ("Riunione con Marco", "riunione", "cancella l'evento di domani", False),
+        ("Riunione con Marco", "", "cancella la riunione", False),
+    ])
+    def test_title_matches_request(self, title, query, request, expected):
+        """Ogni parola della query deve stare sia nel titolo sia nella richiesta."""
+        assert _title_matches_request(title, query, request) is expected
+
+    @pytest.mark.asyncio
+    async def test_get_events_single_unrelated_event_goes_to_step2(self):
+        """get_events restituisce tutta la finestra: mai eliminare senza step 2."""
+        agent = _agent_with_mocks()
+        window = {"operation": "get_events", "events": [{"id": "ev1", "title": "Dentista"}]}
+
+        result = await agent._search_then_act(
+            "get_events", {"start_date": TOMORROW, "end_date": TOMORROW},
+            "cancella la riunione con Marco domani", "", TODAY, "Giovedì", prefetched=window
+        )
+
+        agent._decide.assert_awaited_once()
+        agent._execute_tool.assert_not_awaited()
+        assert result == window
+
+    @pytest.mark.asyncio
+    async def test_search_events_title_mismatch_goes_to_step2(self):
+        """Un risultato trovato solo via descrizione/partecipanti passa dallo step 2."""
+        agent = _agent_with_mocks()
+        found = {"operation": "search_events", "events": [{"id": "ev1", "title": "Pranzo"}]}
+
+        await agent._search_then_act(
+            "search_events", {"query": "marco"},
+            "cancella l'evento con marco", "", TODAY, "Giovedì", prefetched=found
+        )
+
+        agent._decide.assert_awaited_once()
+        agent._execute_tool.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_search_events_single_title_match_deletes_directly(self):
+        """Un solo match per titolo e richiesta di sola eliminazione: niente step 2."""
+        agent = _agent_with_mocks()
+        found = {"operation": "search_events", "events": [{"id": "ev1", "title": "Riunione con Marco"}]}
+
+        await agent._search_then_act(
+            "search_events", {"query": "riunione"},
+            "cancella la riunione con marco", "", TODAY, "Giovedì", prefetched=found
+        )
+
+        agent._decide.assert_not_awaited()
+        agent._execute_tool.assert_awaited_once_with("delete_event", {"event_id": "ev1"})
+
+
+# =============================================================================
+# TEST: Batched create_event
+# =============================================================================
+
+def _create(title: str) -> dict:
+    return {"tool": "create_event", "params": {
+        "title": title, "start_date": TOMORROW, "start_time": "10:00", "end_time": "11:00",
+    }}
+
+
+def _batch_create(events: list[dict]) -> list:
+    return [
+        RuntimeError("quota exceeded") if e["title"] == "boom"
+        else {"id": f"id-{e['title']}", "title": e["title"]}
+        for e in events
+    ]
+
+
+def _batched_agent(decision: list) -> CalendarAgent:
+    agent = CalendarAgent()
+    agent._get_cached_decision = AsyncMock(return_value=decision)
+    agent._execute_tool = AsyncMock(return_value={"operation": "delete_event", "message": "Evento eliminato"})
+    agent._invalidate_events_cache = AsyncMock()
+    return agent
+
+
+_STATE = {"current_input": "crea gli eventi che ti ho elencato per domani", "user_id": "u1", "messages": []}
+
+
+class TestBatchedCreate:
+    """Test creazione di più eventi con una sola richiesta batch."""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_decision_order(self):
+        """Creazioni in batch e altre operazioni tornano nell'ordine della decisione."""
+        decision = [
+            _create("a"),
+            {"tool": "delete_event", "params": {"event_id": "ev9"}},
+            _create("boom"),
+            _create("c"),
+        ]
+        agent = _batched_agent(decision)
+        with patch("jarvis.agents.calendar_agent.calendar_client.batch_create_events",
+                   side_effect=_batch_create) as batch:
+            result = await agent._execute(_STATE)
+
+        assert [e["title"] for e in batch.call_args.args[0]] == ["a", "boom", "c"]
+        agent._execute_tool.assert_awaited_once_with("delete_event", {"event_id": "ev9"})
+        results = result["multiple_results"]
+        assert results[0]["event"]["id"] == "id-a"
+        assert results[1]["operation"] == "delete_event"
+        assert results[2] == {"error": "Errore nella creazione: quota exceeded"}
+        assert results[3]["event"]["id"] == "id-c"
+        agent._invalidate_events_cache.assert_awaited_once_with("u1")
+
+    @pytest.mark.asyncio
+    async def test_all_failed_skips_cache_invalidation(self):
+        """Se nessun evento è stato creato la cache degli eventi resta valida."""
+        agent = _batched_agent([_create("boom"), _create("boom")])
+        with patch("jarvis.agents.calendar_agent.calendar_client.batch_create_events",
+                   side_effect=_batch_create):
+            result = await agent._execute(_STATE)
+
+        assert result["multiple_results"] == [{"error": "Errore nella creazione: quota exceeded"}] * 2
+        agent._invalidate_events_cache.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_becomes_per_event_error(self):
+        """Un errore dell'intera richiesta batch diventa un errore per ogni evento."""
+        agent = _batched_agent([_create("a"), _create("b")])
+        with patch("jarvis.agents.calendar_agent.calendar_client.batch_create_events",
+                   side_effect=ConnectionError("timeout")):
+            result = await agent._execute(_STATE)
+
+        assert result["multiple_results"] == [{"error": "Errore nella creazione: timeout"}] * 2
+        agent._invalidate_events_cache.assert_not_awaited()
+
+
+# =============================================================================
+# TEST: Batched delete_event
+# =============================================================================
+
+def _delete(event_id: str | None) -> dict:
+    return {"tool": "delete_event", "params": {"event_id": event_id} if event_id else {}}
+
+
+def _batch_delete(event_ids: list[str]) -> list:
+    return [RuntimeError("404 not found") if i == "gone" else True for i in event_ids]
+
+
+class TestBatchedDelete:
+    """Test eliminazione di più eventi con una sola richiesta batch."""
+
+    @pytest.mark.asyncio
+    async def test_results_keep_decision_order(self):
+        """Eliminazioni in batch, errori e id mancanti tornano nell'ordine della decisione."""
+        agent = _batched_agent([_delete("ev1"), _delete(None), _delete("gone"), _delete("ev4")])
+        with patch("jarvis.agents.calendar_agent.calendar_client.batch_delete_events",
+                   side_effect=_batch_delete) as batch:
+            result = await agent._execute(_STATE)
+
+        batch.assert_called_once_with(["ev1", "gone", "ev4"])
+        agent._execute_tool.assert_not_awaited()
+        assert result["multiple_results"] == [
+            {"operation": "delete_event", "event_id": "ev1", "message": "Evento eliminato"},
+            {"error": "event_id mancante"},
+            {"error": "Errore nell'eliminazione: 404 not found"},
+            {"operation": "delete_event", "event_id": "ev4", "message": "Evento eliminato"},
+        ]
+        agent._invalidate_events_cache.assert_awaited_once_with("u1")
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_becomes_per_event_error(self):
+        """Un errore dell'intera richiesta batch diventa un errore per ogni evento."""
+        agent = _batched_agent([_delete("ev1"), _delete("ev2")])
+        with patch("jarvis.agents.calendar_agent.calendar_client.batch_delete_events",
+                   side_effect=ConnectionError("timeout")):
+            result = await agent._execute(_STATE)
+
+        assert result["multiple_results"] == [{"error": "Errore nell'eliminazione: timeout"}] * 2
+        agent._invalidate_events_cache.assert_not_awaited()
@@ -0,0 +1,250 @@
+"""
+Test per l'email agent.
+
+Verifica:
+1. Scanner JSON incrementale (_json_value_end) su risposte streaming del modello
+2. _generate_decision: stop appena il valore JSON è completo, fallback sul testo intero
+3. Fast route deterministico per i controlli inbox banali
+4. Invii multipli via batch: ordine dei risultati, destinatari non validi scartati prima
+5. Validazione dei destinatari (_is_valid_email, _recipient_error)
+"""
+
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from jarvis.agents.email_agent import (
+    EmailAgent,
+    _fast_route,
+    _is_valid_email,
+    _json_value_end,
+    _recipient_error,
+)
+
+
+def _slice(text: str) -> str | None:
+    """JSON value starting at the first { or [, None if it is not closed yet."""
+    start = min(i for i in (text.find("{"), text.find("[")) if i >= 0)
+    end = _json_value_end(text, start)
+    return None if end is None else text[start:end]
+
+
+# =============================================================================
+# TEST: _json_value_end
+# =============================================================================
+
+class TestJsonValueEnd:
+    """Test scanner bracket-depth string-aware."""
+
+    def test_fenced_reply(self):
+        """Fence e testo finale restano fuori dal valore."""
+        text = '```json\n{"tool": "get_inbox", "params": {"max_results": 10}}\n```\nEcco fatto.'
+        assert _slice(text) == '{"tool": "get_inbox", "params": {"max_results": 10}}'
+
+    def test_array_reply(self):
+        """Una lista di tool call si chiude sulla ] finale, non sul primo oggetto."""
+        text = '[{"tool": "send_email", "params": {}}, {"tool": "send_email", "params": {}}] trailing'
+        assert _slice(text) == '[{"tool": "send_email", "params": {}}, {"tool": "send_email", "params": {}}]'
+
+    def test_braces_inside_strings(self):
+        """Parentesi dentro le stringhe non cambiano la profondità."""
+        text = '{"tool": "send_email", "params": {"body": "ciao } ] { [ a tutti"}} dopo'
+        assert _slice(text) == '{"tool": "send_email", "params": {"body": "ciao } ] { [ a tutti"}}'
+
+    def test_escaped_quotes(self):
+        """Virgolette escapate non chiudono la stringa; un backslash escapato sì."""
+        text = r'{"params": {"body": "lui ha detto \"}\" e poi \\"}} coda'
+        assert _slice(text) == r'{"params": {"body": "lui ha detto \"}\" e poi \\"}}'
+
+    def test_unterminated_value(self):
+        """Un valore non ancora chiuso ritorna None."""
+        assert _json_value_end('{"tool": "get_inbox", "params": {', 0) is None
+        assert _json_value_end('[{"tool": "x"}, {"tool": "y"', 0) is None
+        assert _json_value_end('{"body": "stringa aperta }', 0) is None
+
+
+# =============================================================================
+# TEST: _generate_decision
+# =============================================================================
+
+def _fake_stream(chunks: list[str], consumed: list[str]):
+    async def generate_stream(*args, **kwargs):
+        for chunk in chunks:
+            consumed.append(chunk)
+            yield chunk
+    return generate_stream
+
+
+class TestGenerateDecision:
+    """Test lettura streaming della decisione."""
+
+    @pytest.mark.asyncio
+    async def test_stops_at_end_of_value(self):
+        """Lo stream viene chiuso appena il JSON è completo."""
+        chunks = ['```json\n{"tool": "get_', 'inbox", "params": {}}', "\n```", " testo finale"]
+        consumed: list[str] = []
+        with patch("jarvis.agents.email_agent.gemini.generate_stream", _fake_stream(chunks, consumed)):
+            result = await EmailAgent()._generate_decision("controlla", "prompt")
+        assert result == '{"tool": "get_inbox", "params": {}}'
+        assert consumed == chunks[:2]
+
+    @pytest.mark.asyncio
+    async def test_unterminated_stream_returns_full_text(self):
+        """Senza un valore completo ritorna tutto il testo (lo gestisce il parser normale)."""
+        chunks = ["Non so ", 'cosa fare {"tool": "get_inbox"']
+        consumed: list[str] = []
+        with patch("jarvis.agents.email_agent.gemini.generate_stream", _fake_stream(chunks, consumed)):
+            result = await EmailAgent()._generate_decision("boh", "prompt")
+        assert result == "".join(chunks)
+        assert consumed == chunks
+
+
+# =============================================================================
+# TEST: Fast route
+# =============================================================================
+
+class TestFastRoute:
+    """Test routing deterministico dei controlli inbox."""
+
+    @pytest.mark.parametrize("phrase, unread_only", [
+        ("controlla email", False),
+        ("controlla le email", False),
+        ("Leggi le mie ultime email", False),
+        ("mostrami la posta", False),
+        ("ho dell'email", False),
+        ("ho email nuove?", True),
+        ("ci sono nuove email?", True),
+        ("ho nuove mail", True),
+        ("controlla le nuove e-mail!", True),
+        ("ho email non lette", True),
+    ])
+    def test_matching_phrases(self, phrase, unread_only):
+        """I controlli banali diventano get_inbox, unread_only solo se chiesto."""
+        assert _fast_route(phrase) == {
+            "tool": "get_inbox",
+            "params": {"max_results": 10, "unread_only": unread_only},
+        }
+
+    @pytest.mark.parametrize("phrase", [
+        "hoemail",
+        "controllaemail",
+        "controlla email da mario",
+        "manda una email",
+        "ho mandato email",
+        "email",
+        "controlla le email di ieri",
+        "ci sono email da luca?",
+    ])
+    def test_non_matching_phrases(self, phrase):
+        """Mittenti, date e azioni vanno all'LLM."""
+        assert _fast_route(phrase) is None
+
+
+# =============================================================================
+# TEST: Batched send_email
+# =============================================================================
+
+def _send(to: str | None) -> dict:
+    return {"tool": "send_email", "params": {"to": to, "subject": "Ciao", "body": "Test"}}
+
+
+def _batch_send(messages: list[dict]) -> list:
+    return [
+        RuntimeError("rate limit") if m["to"] == "fail@example.com"
+        else {"id": f"msg-{i}", "status": "sent"}
+        for i, m in enumerate(messages)
+    ]
+
+
+_STATE = {"current_input": "manda le email che ti ho scritto", "user_id": "u1"}
+
+
+class TestBatchedSend:
+    """Test invio di più email con una sola richiesta batch."""
+
+    @pytest.mark.asyncio
+    async def test_mixed_list_keeps_decision_order(self):
+        """Invii in batch, destinatario non valido e altri tool tornano nell'ordine della decisione."""
+        agent = EmailAgent()
+        agent._get_cached_decision = AsyncMock(return_value=[
+            _send("anna@example.com"),
+            {"tool": "get_inbox", "params": {"max_results": 5}},
+            _send("mario"),
+            _send("fail@example.com"),
+            _send("Luca <luca@example.com>"),
+        ])
+        agent._execute_tool = AsyncMock(return_value={"operation": "get_inbox", "emails": []})
+
+        with patch("jarvis.agents.email_agent.gmail_client.batch_send_emails",
+                   side_effect=_batch_send) as batch:
+            result = await agent._execute(_STATE)
+
+        batch.assert_called_once()
+        assert [m["to"] for m in batch.call_args.args[0]] == [
+            "anna@example.com", "fail@example.com", "Luca <luca@example.com>",
+        ]
+        agent._execute_tool.assert_awaited_once_with("get_inbox", {"max_results": 5})
+        assert result["multiple_results"] == [
+            {"operation": "send_email", "result": {"id": "msg-0", "status": "sent"},
+             "message": "Email inviata a anna@example.com"},
+            {"operation": "get_inbox", "emails": []},
+            {"error": "Destinatario non valido: mario"},
+            {"error": "Errore nell'invio email: rate limit"},
+            {"operation": "send_email", "result": {"id": "msg-2", "status": "sent"},
+             "message": "Email inviata a Luca <luca@example.com>"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_all_recipients_invalid_skips_batch(self):
+        """Senza destinatari validi non parte nessuna richiesta a Gmail."""
+        with patch("jarvis.agents.email_agent.gmail_client.batch_send_emails") as batch:
+            results = await EmailAgent()._batch_send_emails([{"to": ""}, {"to": "mario"}])
+
+        batch.assert_not_called()
+        assert results == [{"error": "Destinatario mancante"}, {"error": "Destinatario non valido: mario"}]
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_becomes_per_email_error(self):
+        """Un errore dell'intera richiesta batch diventa un errore per ogni email."""
+        with patch("jarvis.agents.email_agent.gmail_client.batch_send_emails",
+                   side_effect=ConnectionError("timeout")):
+            results = await EmailAgent()._batch_send_emails([
+                {"to": "a@example.com"}, {"to": "b@example.com"},
+            ])
+
+        assert results == [{"error": "Errore nell'invio email: timeout"}] * 2
+
+
+# =============================================================================
+# TEST: Recipient validation
+# =============================================================================
+
+class TestRecipientValidation:
+    """Test validazione destinatari prima della chiamata a Gmail."""
+
+    @pytest.mark.parametrize("addr, expected", [
+        ("a@b.it", True),
+        ("mario.rossi+lavoro@example.co.uk", True),
+        ("Name <a@b.it>", False),
+        ("a@b.it, c@d.it", False),
+        ("Mario", False),
+        ("a@b@c.it", False),
+        ("a@b", False),
+        ("", False),
+    ])
+    def test_is_valid_email(self, addr, expected):
+        """Solo un indirizzo nudo è valido: nomi e liste passano da getaddresses."""
+        assert _is_valid_email(addr) is expected
+
+    @pytest.mark.parametrize("to, expected", [
+        ("Name <a@b.it>", None),
+        ("a@b.it", None),
+        ("a@b.it, Luca <c@d.it>", None),
+        ("a@b.it, mario", "Destinatario non valido: mario"),
+        ("Mario", "Destinatario non valido: Mario"),
+        ("a@b@c.it", "Destinatario non valido: a@b@c.it"),
+        ("", "Destinatario mancante"),
+        (None, "Destinatario mancante"),
+    ])
+    def test_recipient_error(self, to, expected):
+        """Nomi e liste accettati, nomi nudi e doppia @ rifiutati con messaggio leggibile."""
+        assert _recipient_error(to) == expected
@@ -0,0 +1,141 @@
+"""
+Test per il client Google Calendar.
+
+Verifica:
+1. batch_create_events: risultati nell'ordine d'ingresso anche oltre BATCH_LIMIT
+2. Eccezione di un singolo insert restituita alla sua posizione
+3. batch_delete_events: stesso ordine ed errori per singola eliminazione
+"""
+
+from jarvis.integrations.google_calendar import BATCH_LIMIT, GoogleCalendarClient
+
+
+class FakeBatch:
+    """Batch HTTP finto: risponde ai request_id in ordine inverso, come può fare Google."""
+
+    def __init__(self, callback, respond):
+        self.callback = callback
+        self.respond = respond
+        self.requests: list[tuple[str, object]] = []
+
+    def add(self, request, request_id):
+        self.requests.append((request_id, request))
+
+    def execute(self, http=None):
+        for request_id, request in reversed(self.requests):
+            try:
+                response, exception = self.respond(request), None
+            except Exception as e:
+                response, exception = None, e
+            self.callback(request_id, response, exception)
+
+
+class FakeEvents:
+    """events() finto: delete restituisce i propri argomenti come richiesta."""
+
+    def delete(self, calendarId, eventId):
+        return {"calendarId": calendarId, "eventId": eventId}
+
+
+class FakeService:
+    """Servizio Calendar finto che registra i batch creati."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.batches: list[FakeBatch] = []
+
+    def events(self):
+        return FakeEvents()
+
+    def new_batch_http_request(self, callback):
+        batch = FakeBatch(callback, self.respond)
+        self.batches.append(batch)
+        return batch
+
+
+def _client(respond) -> GoogleCalendarClient:
+    client = GoogleCalendarClient.__new__(GoogleCalendarClient)
+    client.service = FakeService(respond)
+    client._http = lambda: None
+    return client
+
+
+# =============================================================================
+# TEST: batch_create_events
+# =============================================================================
+
+def _insert(request: dict) -> dict:
+    if request["title"] == "boom":
+        raise RuntimeError("quota exceeded")
+    return {"id": f"id-{request['title']}", "summary": request["title"]}
+
+
+class TestBatchCreateEvents:
+    """Test creazione eventi via batch HTTP."""
+
+    def test_order_across_batch_limit(self):
+        """Oltre BATCH_LIMIT si aprono più batch, l'ordine dei risultati resta quello d'ingresso."""
+        client = _client(_insert)
+        client._insert_request = lambda **kwargs: kwargs
+        events = [{"title": f"ev{i}", "start": None, "end": None} for i in range(BATCH_LIMIT * 2 + 20)]
+
+        results = client.batch_create_events(events)
+
+        assert [len(b.requests) for b in client.service.batches] == [BATCH_LIMIT, BATCH_LIMIT, 20]
+        assert [r["id"] for r in results] == [f"id-ev{i}" for i in range(len(events))]
+        assert results[BATCH_LIMIT]["title"] == f"ev{BATCH_LIMIT}"
+
+    def test_item_exception_kept_in_place(self):
+        """Un insert fallito non blocca gli altri: l'eccezione resta alla sua posizione."""
+        client = _client(_insert)
+        client._insert_request = lambda **kwargs: kwargs
+        titles = ["a", "boom", "c"] + [f"ev{i}" for i in range(BATCH_LIMIT)]
+
+        results = client.batch_create_events([{"title": t} for t in titles])
+
+        assert isinstance(results[1], RuntimeError)
+        assert [r["title"] for i, r in enumerate(results) if i != 1] == [t for t in titles if t != "boom"]
+
+    def test_empty_list_sends_nothing(self):
+        """Nessun evento, nessun batch."""
+        client = _client(_insert)
+        assert client.batch_create_events([]) == []
+        assert client.service.batches == []
+
+
+# =============================================================================
+# TEST: batch_delete_events
+# =============================================================================
+
+def _delete(request: dict) -> str:
+    if request["eventId"] == "gone":
+        raise RuntimeError("404 not found")
+    return ""
+
+
+class TestBatchDeleteEvents:
+    """Test eliminazione eventi via batch HTTP."""
+
+    def test_order_across_batch_limit(self):
+        """Più batch oltre BATCH_LIMIT; un True per ogni eliminazione, in ordine."""
+        client = _client(_delete)
+        event_ids = [f"ev{i}" for i in range(BATCH_LIMIT + 1)]
+
+        results = client.batch_delete_events(event_ids, calendar_id="work")
+
+        batches = client.service.batches
+        assert [len(b.requests) for b in batches] == [BATCH_LIMIT, 1]
+        assert [r["eventId"] for b in batches for _, r in b.requests] == event_ids
+        assert {r["calendarId"] for b in batches for _, r in b.requests} == {"work"}
+        assert results == [True] * len(event_ids)
+
+    def test_item_exception_kept_in_place(self):
+        """Un'eliminazione fallita resta alla sua posizione, le altre riescono."""
+        client = _client(_delete)
+        event_ids = [f"ev{i}" for i in range(BATCH_LIMIT)] + ["gone", "last"]
+
+        results = client.batch_delete_events(event_ids)
+
+        assert isinstance(results[BATCH_LIMIT], RuntimeError)
+        assert results[:BATCH_LIMIT] == [True] * BATCH_LIMIT
+        assert results[-1] is True
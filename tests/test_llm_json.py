@@ -0,0 +1,39 @@
+"""
+Test per il parsing del JSON restituito dall'LLM.
+
+Verifica:
+1. Risposte nude, con fence ```json e con testo dopo la fence
+2. Risposte troncate prima della fence di chiusura
+3. Errore su payload non JSON
+"""
+
+import pytest
+
+from jarvis.utils.llm_json import parse_llm_json
+
+
+class TestParseLlmJson:
+    """Test parse_llm_json."""
+
+    @pytest.mark.parametrize("reply, expected", [
+        ('{"tool": "get_inbox"}', {"tool": "get_inbox"}),
+        ('  {"tool": "get_inbox"}\n', {"tool": "get_inbox"}),
+        ('```json\n{"tool": "get_inbox"}\n```', {"tool": "get_inbox"}),
+        ('```\n[{"tool": "a"}, {"tool": "b"}]\n```', [{"tool": "a"}, {"tool": "b"}]),
+        ('```json\n{"tool": "get_inbox"}\n```\nEcco la decisione.', {"tool": "get_inbox"}),
+    ])
+    def test_fenced_and_bare_replies(self, reply, expected):
+        """Fence opzionale, testo dopo la fence ignorato."""
+        assert parse_llm_json(reply) == expected
+
+    def test_missing_closing_fence(self):
+        """Una risposta troncata prima della fence di chiusura resta leggibile."""
+        assert parse_llm_json('```json\n{"agents": ["calendar"], "goal": "x"}') == {
+            "agents": ["calendar"],
+            "goal": "x",
+        }
+
+    def test_invalid_json_raises_value_error(self):
+        """Payload non JSON: ValueError (orjson.JSONDecodeError)."""
+        with pytest.raises(ValueError):
+            parse_llm_json("Non ho capito la richiesta")